@@ -1,32 +1,66 @@
 from __future__ import annotations
 import os
-import configparser
 from pathlib import Path
+from typing import Any, Dict
 
 # --------------------------------------------------
 #   INI 파일 로딩
 # --------------------------------------------------
 CONFIG_PATH = Path(__file__).resolve().parent / "config.ini"
-parser = configparser.ConfigParser()
-if CONFIG_PATH.exists():
+
+
+# (section, key) ➜ 값 키
+_INI_KEYS = {
+    ("upbit", "access_key"): "upbit_access_key",
+    ("upbit", "secret_key"): "upbit_secret_key",
+    ("telegram", "token"): "telegram_token",
+    ("telegram", "chat_id"): "telegram_chat_id",
+}
+
+
+def _load_ini() -> Dict[str, Any]:
+    """config.ini 를 파싱하여 사용하는 값만 dict 로 추출 (파일이 없으면 빈 dict)"""
+    if not CONFIG_PATH.exists():
+        return {}
+
+    import configparser
+
+    parser = configparser.ConfigParser()
     parser.read(CONFIG_PATH, encoding="utf-8")
-else:
-    parser = None
-
-# Upbit
-UPBIT_ACCESS_KEY: str | None = (
-    parser.get("upbit", "access_key") if parser and parser.has_option("upbit", "access_key") else os.getenv("UPBIT_ACCESS_KEY")
-)
-UPBIT_SECRET_KEY: str | None = (
-    parser.get("upbit", "secret_key") if parser and parser.has_option("upbit", "secret_key") else os.getenv("UPBIT_SECRET_KEY")
-)
-
-# Telegram
-TELEGRAM_TOKEN: str | None = (
-    parser.get("telegram", "token") if parser and parser.has_option("telegram", "token") else os.getenv("TELEGRAM_TOKEN")
-)
-TELEGRAM_CHAT_ID: int | None = None
-if parser and parser.has_option("telegram", "chat_id"):
-    TELEGRAM_CHAT_ID = parser.getint("telegram", "chat_id")
-elif os.getenv("TELEGRAM_CHAT_ID"):
-    TELEGRAM_CHAT_ID = int(os.getenv("TELEGRAM_CHAT_ID")) 
\ No newline at end of file
+
+    values: Dict[str, Any] = {
+        name: parser.get(section, key, fallback=None)
+        for (section, key), name in _INI_KEYS.items()
+    }
+    if values["telegram_chat_id"] is not None:
+        values["telegram_chat_id"] = parser.getint("telegram", "chat_id")
+    return values
+
+
+# --------------------------------------------------
+#   지연 로딩 (PEP 562)
+#   키를 실제로 참조하는 프로세스만 INI 를 읽는다.
+# --------------------------------------------------
+_KEYS = ("UPBIT_ACCESS_KEY", "UPBIT_SECRET_KEY", "TELEGRAM_TOKEN", "TELEGRAM_CHAT_ID")
+_ini: Dict[str, Any] | None = None
+
+
+def _ini_or_env(key: str, env_name: str) -> str | None:
+    global _ini
+    if _ini is None:
+        _ini = _load_ini()
+    value = _ini.get(key)
+    return value if value is not None else os.getenv(env_name)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _KEYS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = _ini_or_env(name.lower(), name)
+    if name == "TELEGRAM_CHAT_ID" and isinstance(value, str):
+        value = int(value) if value else None
+
+    # 이후 접근은 모듈 전역에서 바로 조회되도록 저장
+    globals()[name] = value
+    return value
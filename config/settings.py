@@ -1,4 +1,5 @@
 from __future__ import annotations
+import os
 import pathlib
 
 # 프로젝트 루트 경로
@@ -29,6 +30,9 @@ BUY_SIGNAL_PARAMS = {
     "rsi_oversold": 30.0,
 }
 
+# IndicatorWorker 프로세스 수 – WebSocket 프로세스가 종목을 crc32(market) % N 으로 나눠 워커별 틱 링에 기록
+INDICATOR_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
 # Upbit /market/all 필터 단계에서 제외할 조건 (함수로도 확장 가능)
 SAFETY_FILTERS = {
     "exclude_warning": True,  # 투자유의 종목 제외
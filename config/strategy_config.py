@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Dict, Any, List
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping
 
 # 다중 종목 지원
 SYMBOLS: List[str] = ["KRW-BTC", "KRW-ETH"]  # 거래할 종목 리스트
@@ -62,6 +65,18 @@ MAX_POSITION_KRW: Dict[str, float] = {
     "KRW-ETH": 150_000,
 }
 
+# 심볼 문자열 intern – 핫패스 dict 조회가 포인터 비교로 끝나도록
+SYMBOLS = [sys.intern(s) for s in SYMBOLS]
+SYMBOL_SPECIFIC_CONFIG = {sys.intern(k): v for k, v in SYMBOL_SPECIFIC_CONFIG.items()}
+MAX_POSITION_KRW = {sys.intern(k): v for k, v in MAX_POSITION_KRW.items()}
+
+# 부분 청산 레벨/비율은 읽기 전용 – float tuple 로 고정 (틱마다 원소 하나씩 인덱싱하므로 ndarray 보다 tuple 이 빠름)
+_FLOAT_SEQ_KEYS = ("partial_close_levels", "partial_close_ratios")
+for _cfg in SYMBOL_SPECIFIC_CONFIG.values():
+    for _key in _FLOAT_SEQ_KEYS:
+        if _key in _cfg:
+            _cfg[_key] = tuple(float(v) for v in _cfg[_key])
+
 # 기본 최대 주문 금액 (새 종목 추가 시)
 DEFAULT_MAX_POSITION_KRW: float = 100_000
 
@@ -69,16 +84,18 @@ DEFAULT_MAX_POSITION_KRW: float = 100_000
 MAX_TOTAL_POSITION_KRW: float = 500_000  # 전체 포지션 합계 제한
 MAX_CONCURRENT_POSITIONS: int = 2        # 동시 포지션 수 제한
 
-def get_strategy_config(symbol: str) -> Dict[str, Any]:
-    """종목별 전략 설정 반환"""
-    config = DEFAULT_STRATEGY_CONFIG.copy()
-    
-    # 종목별 설정이 있으면 오버라이드
-    if symbol in SYMBOL_SPECIFIC_CONFIG:
-        config.update(SYMBOL_SPECIFIC_CONFIG[symbol])
-    
-    return config
+# 종목별 병합 설정을 import 시점에 한 번만 만들어 읽기 전용 뷰로 공유
+_DEFAULT_CONFIG_VIEW: Mapping[str, Any] = MappingProxyType(dict(DEFAULT_STRATEGY_CONFIG))
+_MERGED_CONFIG_VIEWS: Dict[str, Mapping[str, Any]] = {
+    symbol: MappingProxyType({**DEFAULT_STRATEGY_CONFIG, **override})
+    for symbol, override in SYMBOL_SPECIFIC_CONFIG.items()
+}
+
+def get_strategy_config(symbol: str) -> Mapping[str, Any]:
+    """종목별 전략 설정 반환 (읽기 전용 – 수정이 필요하면 dict(...) 로 복사해서 사용)"""
+    return _MERGED_CONFIG_VIEWS.get(symbol, _DEFAULT_CONFIG_VIEW)
 
+@lru_cache(maxsize=64)
 def get_max_position_krw(symbol: str) -> float:
     """종목별 최대 주문 금액 반환"""
     return MAX_POSITION_KRW.get(symbol, DEFAULT_MAX_POSITION_KRW)
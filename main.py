@@ -1,45 +1,65 @@
 import argparse
 import multiprocessing as mp
-import time
+import sys
 from multiprocessing import Manager
+from multiprocessing import connection as mp_connection
 
-from src.processes.websocket_proc import websocket_process
-from src.processes.trader_proc import trader_process
-from src.processes.api_proc import api_process
-from src.processes.telegram_proc import telegram_process
-from src.database.database import DBWriter
 from src.utils.logger import get_logger
-from config.strategy_config import SYMBOLS
-from config.api_config import TELEGRAM_TOKEN, TELEGRAM_CHAT_ID
-from src.utils.symbol_manager import SymbolManager
-from src.indicators.indicator_worker import indicator_worker_process
 
 logger = get_logger(__name__)
 
+# 메인 루프가 심볼 갱신 여부를 확인하는 주기(초)
+SYMBOL_CHECK_INTERVAL = 30.0
+
 
 def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
     """엔트리 포인트 – 멀티프로세스 초기화 및 실행"""
 
-    # Docker 환경에서 안전한 멀티프로세싱을 위해 spawn 사용
-    if mp.get_start_method(allow_none=True) != 'spawn':
-        mp.set_start_method("spawn", force=True)
+    # Linux 는 fork: 아래에서 import·파싱한 모듈과 설정을 자식이 copy-on-write 로 그대로 물려받는다.
+    # 그 외(Windows/macOS)는 spawn: 자식이 이 모듈을 __mp_main__ 으로 다시 import 하므로
+    # 무거운 의존성(pandas, telegram, pyupbit, sqlalchemy 등)과 설정 파싱은 main() 안에서만 import 한다.
+    # 주의: fork 이전(= 모든 mp.Process.start() 이전)에 메인 프로세스에서 스레드를 띄우지 말 것.
+    start_method = "fork" if sys.platform.startswith("linux") else "spawn"
+    if mp.get_start_method(allow_none=True) != start_method:
+        mp.set_start_method(start_method, force=True)
+
+    from src.processes.websocket_proc import websocket_process
+    from src.processes.trader_proc import trader_process
+    from src.processes.api_proc import api_process
+    from src.processes.telegram_proc import telegram_process
+    from src.database.database import DBWriter
+    from config.strategy_config import SYMBOLS
+    from config.api_config import (
+        TELEGRAM_TOKEN,
+        TELEGRAM_CHAT_ID,
+        UPBIT_ACCESS_KEY,
+        UPBIT_SECRET_KEY,
+    )
+    from src.utils.symbol_manager import SymbolManager
+    from src.utils.tick_ring import TickRing
+    from src.utils.buyable_set import BuyableSet
+    from src.indicators.indicator_worker import indicator_worker_process
+    from config.settings import INDICATOR_WORKERS
 
     manager: Manager = mp.Manager()
 
-    # tick_queues 를 Manager.dict 로 만들어 동적 추가·삭제 가능하게
-    tick_queues: dict = manager.dict()
-    for symbol in SYMBOLS:
-        tick_queues[symbol] = manager.Queue(maxsize=2000)
+    # 틱 링 버퍼 (WebSocket → Trader, 공유 메모리)
+    # symbol_id ➜ market 매핑은 변경이 드물어 Manager dict 로 공유한다.
+    symbol_table = manager.dict()
+    tick_ring = TickRing(symbol_table=symbol_table)
+    # IndicatorWorker 별 틱 링 – WebSocket 프로세스가 partition_of(market) 로 골라 기록 (symbol_table 공유)
+    indicator_rings = [TickRing(symbol_table=symbol_table) for _ in range(INDICATOR_WORKERS)]
+    active_symbols: set[str] = set(SYMBOLS)
 
     # IndicatorWorker 공유 객체 -----------------------------------------
-    buyable_symbols = manager.dict()  # {market: True}
+    # 매수 가능 종목 플래그 배열 (인덱스 = TickRing symbol_id)
+    buyable_symbols = BuyableSet(symbol_table=symbol_table)
 
     # 심볼 매니저 초기화 (메인 프로세스 전역) – buyable_symbols 활용
     symbol_manager = SymbolManager(SYMBOLS, buyable_symbols=buyable_symbols)
 
-    # 심볼 업데이트 브로드캐스트용 큐 & Event
-    symbols_event_q = manager.Queue()
-    symbols_updated_ev = manager.Event()
+    # 심볼 업데이트 전달용 큐 – WebSocket 리스너가 blocking get 으로 대기 (None 은 종료 신호)
+    symbols_event_q = mp.Queue()
 
     # WebSocket 프로세스 단일 인스턴스 관리 (재시작 대신 subscribe 업데이트 사용)
     ws_proc: mp.Process | None = None
@@ -50,15 +70,10 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
         if ws_proc is not None and ws_proc.is_alive():
             return
 
-        # 큐 준비
-        for sym in symbols:
-            if sym not in tick_queues:
-                tick_queues[sym] = manager.Queue(maxsize=2000)
-
         ws_proc = mp.Process(
             target=websocket_process,
-            args=(symbols, tick_queues, shutdown_ev, symbols_event_q, symbols_updated_ev),
-            daemon=False,  # pyupbit 내부에서 프로세스를 생성하므로 daemon=False 필요
+            args=(symbols, tick_ring, indicator_rings, shutdown_ev, symbols_event_q),
+            daemon=True,  # 내부에서 스레드만 사용하므로 다른 워커와 동일하게 daemon
             name="WebSocket"
         )
         ws_proc.start()
@@ -75,13 +90,16 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
                 procs.remove(ws_proc)
         _spawn_ws(symbols)
 
-    command_q = manager.Queue()
-    notify_q = manager.Queue()
-    db_q = manager.Queue()
-    resp_q = manager.Queue()
-    order_q = manager.Queue()
+    # 프로세스 간 메시지 큐 – Manager 프록시를 거치지 않는 mp.Queue (pipe + feeder thread)
+    # Manager 는 공유 dict 와 저빈도 심볼 이벤트에만 사용한다.
+    command_q = mp.Queue()
+    notify_q = mp.Queue()
+    db_q = mp.Queue()
+    resp_q = mp.Queue()
+    order_q = mp.Queue()
 
-    shutdown_ev = manager.Event()
+    # 모든 자식이 루프마다 is_set() 을 확인하므로 Manager RPC 가 없는 OS 수준 Event 사용
+    shutdown_ev = mp.Event()
 
     logger.info("AutoCoin 시작: 전략=%s, 종목=%s", strategy_name, SYMBOLS)
 
@@ -90,29 +108,17 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
     # 초기 웹소켓 프로세스 생성
     _spawn_ws(symbol_manager.symbols)
     
-    # 통합 틱 큐 (모든 종목의 데이터를 하나로 합침)
-    unified_tick_q = manager.Queue(maxsize=5000)
-    
-    # 틱 데이터 통합 프로세스
-    tick_merger_proc = mp.Process(
-        target=_tick_merger_process,
-        args=(tick_queues, unified_tick_q, shutdown_ev),
-        daemon=True,
-        name="TickMerger"
-    )
-    procs.append(tick_merger_proc)
-    
     # 나머지 프로세스들
     trader_proc = mp.Process(
         target=trader_process, 
-        args=(unified_tick_q, command_q, notify_q, db_q, order_q, resp_q, shutdown_ev, strategy_name), 
+        args=(tick_ring, command_q, notify_q, db_q, order_q, resp_q, shutdown_ev, strategy_name), 
         daemon=True,
         name="Trader"
     )
     
     api_proc = mp.Process(
         target=api_process, 
-        args=(order_q, resp_q, notify_q, shutdown_ev), 
+        args=(order_q, resp_q, notify_q, shutdown_ev, (UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)),
         daemon=True,
         name="API"
     )
@@ -130,7 +136,7 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
     if use_telegram and TELEGRAM_TOKEN and TELEGRAM_CHAT_ID:
         telegram_proc = mp.Process(
             target=telegram_process,
-            args=(command_q, notify_q, shutdown_ev),
+            args=(command_q, notify_q, shutdown_ev, (TELEGRAM_TOKEN, TELEGRAM_CHAT_ID)),
             daemon=True,
             name="Telegram",
         )
@@ -139,13 +145,15 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
         logger.info("Telegram 비활성화 상태로 시작합니다 (use_telegram=%s, token=%s, chat_id=%s)", use_telegram, bool(TELEGRAM_TOKEN), bool(TELEGRAM_CHAT_ID))
 
     # ---------------- IndicatorWorker 프로세스 -------------------------
-    indicator_proc = mp.Process(
-        target=indicator_worker_process,
-        args=(unified_tick_q, buyable_symbols, shutdown_ev),
-        daemon=True,
-        name="IndicatorWorker",
-    )
-    procs.append(indicator_proc)
+    # 워커마다 전용 틱 링을 읽는다 (종목 분배는 생산자 쪽에서 끝남)
+    for worker_idx, indicator_ring in enumerate(indicator_rings):
+        indicator_proc = mp.Process(
+            target=indicator_worker_process,
+            args=(indicator_ring, buyable_symbols, shutdown_ev, worker_idx),
+            daemon=True,
+            name=f"IndicatorWorker-{worker_idx}",
+        )
+        procs.append(indicator_proc)
 
     # 프로세스 시작
     for p in procs:
@@ -154,35 +162,35 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
             logger.info("프로세스 시작: %s (pid=%s)", p.name, p.pid)
 
     try:
-        while any(p.is_alive() for p in procs):
+        while True:
+            alive = [p for p in procs if p.is_alive()]
+            if not alive:
+                break
+
+            # 자식 종료(sentinel) 또는 심볼 갱신 체크 주기까지 블로킹 대기 – 1초 폴링 없음
+            mp_connection.wait([p.sentinel for p in alive], timeout=SYMBOL_CHECK_INTERVAL)
+
             # 심볼 동적 갱신 체크 (30초 간격)
             try:
                 if symbol_manager.maybe_refresh():
                     new_syms = symbol_manager.symbols
-                    current_syms = set(tick_queues.keys())
-                    add_syms = set(new_syms) - current_syms
-                    rem_syms = current_syms - set(new_syms)
+                    add_syms = set(new_syms) - active_symbols
+                    rem_syms = active_symbols - set(new_syms)
 
                     if add_syms or rem_syms:
-                        # 큐 생성/제거
-                        for s in add_syms:
-                            tick_queues[s] = manager.Queue(maxsize=2000)
-                        for s in rem_syms:
-                            tick_queues.pop(s, None)
+                        active_symbols = set(new_syms)
 
                         _spawn_ws(new_syms)
 
                         # WebSocket 프로세스에 심볼 업데이트 브로드캐스트
                         symbols_event_q.put(list(new_syms))
-                        symbols_updated_ev.set()
 
             except Exception as exc:  # pragma: no cover
                 logger.warning("Symbol refresh error: %s", exc)
-
-            time.sleep(1)
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt 감지 – 종료 신호 발송")
         shutdown_ev.set()
+        symbols_event_q.put(None)  # WebSocket 심볼 리스너 즉시 깨우기
     finally:
         # 모든 프로세스 종료 대기
         for p in procs:
@@ -191,32 +199,10 @@ def main(strategy_name: str = "scalping", use_telegram: bool = True) -> None:
                 p.join(timeout=5)
                 logger.info("프로세스 종료: %s", p.name)
 
-
-def _tick_merger_process(tick_queues: dict, unified_queue, shutdown_ev) -> None:
-    """여러 종목의 틱 데이터를 하나의 큐로 통합"""
-    logger.info("틱 통합 프로세스 시작")
-    
-    while not shutdown_ev.is_set():
-        try:
-            # 각 종목의 큐에서 데이터 수집
-            for symbol, queue in tick_queues.items():
-                try:
-                    if not queue.empty():
-                        tick_data = queue.get_nowait()
-                        # 종목 정보 추가
-                        tick_data["market"] = symbol
-                        tick_data["code"] = symbol
-                        unified_queue.put_nowait(tick_data)
-                except Exception:
-                    continue
-            
-            time.sleep(0.001)  # CPU 사용률 조절
-            
-        except Exception as exc:
-            logger.error("틱 통합 오류: %s", exc)
-            time.sleep(0.1)
-    
-    logger.info("틱 통합 프로세스 종료")
+        # 공유 메모리 해제
+        for shm_obj in (tick_ring, *indicator_rings, buyable_symbols):
+            shm_obj.close()
+            shm_obj.unlink()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+"""CandleCache – get_candles 결과를 메모리(LRU+TTL) 와 디스크(pickle) 2단계로 캐시.
+
+• to=None(최신 구간) 요청은 새 캔들이 계속 생기므로 짧은 TTL 동안만 메모리에 보관한다.
+• to 가 지정된 과거 구간은 결과가 바뀌지 않으므로 만료 없이 메모리에 두고 디스크에도 저장해
+  프로세스 재시작 후에도 네트워크 호출 없이 재사용한다.
+"""
+
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from config.settings import BASE_DIR
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_DIR = BASE_DIR / "data" / "cache"
+
+_UNSAFE_CHARS = re.compile(r"[^0-9A-Za-z_.-]")
+
+
+class CandleCache:
+    """(market, interval, count, to) 키 기반 캔들 캐시
+
+    Args:
+        live_ttl: to=None 요청의 메모리 보관 시간(초)
+        maxsize: 메모리에 보관할 최대 항목 수 (LRU)
+        cache_dir: 과거 구간 결과를 저장할 디렉터리 (None 이면 디스크 캐시 미사용)
+    """
+
+    def __init__(self, live_ttl: float = 10.0, maxsize: int = 512, cache_dir: Optional[Path] = CACHE_DIR):
+        self.live_ttl = live_ttl
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._mem: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        market: str,
+        interval: str,
+        count: int,
+        to: Optional[str],
+        loader: Callable[[], Any],
+    ) -> Any:
+        """캐시에 있으면 반환하고, 없으면 loader() 결과를 저장 후 반환"""
+        key = (market, interval, count, to)
+        now = time.monotonic()
+
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is not None and hit[0] > now:
+                self._mem.move_to_end(key)
+                return hit[1]
+
+        data = self._load_disk(key) if to is not None else None
+        if data is None:
+            data = loader()
+            if data is None:
+                return None  # 조회 실패는 캐시하지 않는다
+            if to is not None:
+                self._save_disk(key, data)
+
+        expires_at = now + self.live_ttl if to is None else float("inf")
+        with self._lock:
+            self._mem[key] = (expires_at, data)
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.maxsize:
+                self._mem.popitem(last=False)
+        return data
+
+    # ----------------------- Disk ----------------------- #
+    def _path(self, key: Tuple) -> Path:
+        name = "_".join(_UNSAFE_CHARS.sub("-", str(part)) for part in key)
+        return self.cache_dir / f"{name}.pkl"
+
+    def _load_disk(self, key: Tuple) -> Any:
+        if self.cache_dir is None:
+            return None
+        try:
+            with self._path(key).open("rb") as fp:
+                return pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:  # pragma: no cover – 손상된 캐시는 무시하고 재조회
+            logger.warning("candle cache read error (%s): %s", key, exc)
+            return None
+
+    def _save_disk(self, key: Tuple, data: Any) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("wb") as fp:
+                pickle.dump(data, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            tmp_path.replace(path)
+        except OSError as exc:  # pragma: no cover
+            logger.warning("candle cache write error (%s): %s", key, exc)
@@ -1,14 +1,66 @@
 from __future__ import annotations
-import pyupbit
-
-from config.api_config import UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, List, Dict, Optional
 
+import pyupbit
+import pyupbit.request_api
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.api.candle_cache import CandleCache
 from src.utils.errors import UpbitAPIError
 from src.utils.rate_limiter import rate_limit
 
 
+# ----------------------------------------------------------------------------
+# pyupbit HTTP 세션 공유
+# ----------------------------------------------------------------------------
+
+class _SessionRequests:
+    """pyupbit.request_api 의 `requests` 모듈 대체물
+
+    get/post/delete 만 스레드별 requests.Session 으로 보내 keep-alive·커넥션 풀을 재사용하고,
+    나머지 속성은 원래 requests 모듈에 위임한다.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
+        # 어댑터 단 재시도는 두지 않는다: 서명 요청은 JWT nonce 가 1회용이고, 429 재시도는 rate_limit 을 우회한다
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount("https://", adapter)
+        return session
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+        return session
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.session.post(url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.session.delete(url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(requests, name)
+
+
+def _install_pyupbit_session() -> None:
+    """pyupbit 의 모든 REST 호출(quotation/exchange)이 공유 세션을 사용하도록 교체 (프로세스당 1회)"""
+    if not isinstance(pyupbit.request_api.requests, _SessionRequests):
+        pyupbit.request_api.requests = _SessionRequests()
+
+
 class UpbitAPI:
     """업비트 REST API 래퍼
 
@@ -16,12 +68,21 @@ class UpbitAPI:
     UpbitAPIError 로 래핑한다. 동기 방식으로만 제공한다.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, access_key: Optional[str] = None, secret_key: Optional[str] = None) -> None:
+        if access_key is None or secret_key is None:
+            # 키가 전달되지 않은 경우에만 설정 모듈을 읽는다
+            from config.api_config import UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY
+
+            access_key = access_key or UPBIT_ACCESS_KEY
+            secret_key = secret_key or UPBIT_SECRET_KEY
+        _install_pyupbit_session()
         try:
-            self._client = pyupbit.Upbit(UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY)
+            self._client = pyupbit.Upbit(access_key, secret_key)
         except Exception as exc:  # pragma: no cover
             raise UpbitAPIError("Upbit 인증 실패: 키를 확인하세요") from exc
 
+        self._candle_cache = CandleCache()
+
     # ----------------------------- 계좌 ----------------------------- #
     @rate_limit(endpoint='account')
     def list_accounts(self) -> List[Dict[str, Any]]:
@@ -104,14 +165,25 @@ class UpbitAPI:
         except Exception as exc:
             raise UpbitAPIError(str(exc)) from exc
 
+    # 일괄 취소 시 동시에 보낼 최대 요청 수 (cancel 버킷 용량과 동일)
+    CANCEL_WORKERS = 8
+
     def cancel_orders(self, uuids: List[str]):
-        results: List[Dict[str, Any]] = []
-        for uid in uuids:
+        """여러 주문을 병렬로 취소 (결과 순서는 uuids 순서와 동일)
+
+        개별 호출은 cancel_order 의 @rate_limit(endpoint='cancel') 을 그대로 거치므로 초당 한도를 넘지 않는다.
+        """
+        if not uuids:
+            return []
+
+        def _cancel(uid: str) -> Dict[str, Any]:
             try:
-                results.append(self.cancel_order(uuid=uid))
+                return self.cancel_order(uuid=uid)
             except UpbitAPIError as exc:  # pragma: no cover – 개별 실패 무시하고 계속
-                results.append({"uuid": uid, "error": str(exc)})
-        return results
+                return {"uuid": uid, "error": str(exc)}
+
+        with ThreadPoolExecutor(max_workers=min(self.CANCEL_WORKERS, len(uuids))) as executor:
+            return list(executor.map(_cancel, uuids))
 
     # ----------------------------- 시세 ----------------------------- #
     @rate_limit(endpoint='market')
@@ -122,7 +194,21 @@ class UpbitAPI:
         except Exception as exc:
             raise UpbitAPIError(str(exc)) from exc
 
-    @rate_limit(endpoint='market')
+    # pyupbit interval 매핑
+    _CANDLE_INTERVALS = {
+        "sec1": "minute1",
+        "sec30": "minute30",
+        "sec60": "minute60",
+        "min1": "minute1",
+        "min3": "minute3",
+        "min5": "minute5",
+        "min15": "minute15",
+        "min30": "minute30",
+        "min60": "minute60",
+        "min240": "minute240",
+        "day": "day",
+    }
+
     def get_candles(
         self,
         unit: str,
@@ -136,22 +222,17 @@ class UpbitAPI:
         • "sec60"  → 60초
         • "min1"   → 1분
         • "day"    → 일봉
+
+        같은 요청은 CandleCache 에서 반환하며, 캐시 적중 시에는 rate limit 토큰도 소비하지 않는다.
         """
+        interval = self._CANDLE_INTERVALS.get(unit, unit)
+        return self._candle_cache.get(
+            market, interval, count, to, lambda: self._fetch_candles(market, interval, count, to)
+        )
+
+    @rate_limit(endpoint='market')
+    def _fetch_candles(self, market: str, interval: str, count: int, to: Optional[str]):
         try:
-            interval_map = {
-                "sec1": "minute1",
-                "sec30": "minute30",
-                "sec60": "minute60",
-                "min1": "minute1",
-                "min3": "minute3",
-                "min5": "minute5",
-                "min15": "minute15",
-                "min30": "minute30",
-                "min60": "minute60",
-                "min240": "minute240",
-                "day": "day",
-            }
-            interval = interval_map.get(unit, unit)
             return pyupbit.get_ohlcv(market, interval=interval, count=count, to=to)
         except Exception as exc:
             raise UpbitAPIError(str(exc)) from exc
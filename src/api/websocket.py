@@ -1,146 +1,189 @@
 from __future__ import annotations
+import asyncio
+import json
 import threading
 import time
-from queue import Queue
+import uuid
+from queue import Full, Queue
 from typing import List, Optional
-import pyupbit
+
+import websockets
+
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 수신 프레임 파서 – orjson 이 설치되어 있으면 C 구현 파서 사용 (bytes 를 그대로 받는다)
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as json_loads
+
+UPBIT_WS_URL = "wss://api.upbit.com/websocket/v1"
+
 
 class WebSocketClient:
-    """업비트 웹소켓으로부터 실시간 데이터 수신 (자동 재연결 지원)"""
+    """업비트 웹소켓으로부터 실시간 데이터 수신 (자동 재연결 지원)
+
+    pyupbit.WebSocketManager 는 채널마다 별도 프로세스 + 내부 Queue 를 거쳐 메시지를 넘겨주므로,
+    websockets 연결을 asyncio 코루틴으로 직접 소유하여 한 TCP 연결에서 여러 채널을 함께 구독하고
+    수신 프레임을 곧바로 market_queue 에 넣는다.
+    """
+
+    DROP_LOG_EVERY = 1000  # 드롭 경고 로그 간격(건)
+    CORK_SIZE = 16  # 큐에 한 번에 넣을 최대 메시지 수
+    CORK_WINDOW = 0.001  # 첫 메시지 이후 최대 보류 시간(초)
+    PING_INTERVAL = 20.0  # websockets keepalive ping 간격(초)
+    WATCHDOG_INTERVAL = 0.5  # 종료/heartbeat 확인 간격(초)
 
     def __init__(self, channels: List[str], symbols: List[str]):
         self.channels = channels
         self.symbols = symbols
-        self.wm: Optional[pyupbit.WebSocketManager] = None
         self.last_heartbeat = time.time()
         self.heartbeat_timeout = 30.0  # 30초 이상 데이터 없으면 재연결
         self.is_connected = False
+        self.dropped = 0  # 큐 포화로 버린 메시지 수
+        self._next_drop_log = 1  # 다음 드롭 경고를 남길 누적 건수
+        # 현재 연결과 이를 구동하는 이벤트 루프 (다른 스레드에서 disconnect 할 때 사용)
+        self._ws = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _subscribe_message(self) -> str:
+        """현재 channels/symbols 구독 요청 메시지 (채널별 type 항목을 한 요청에 담는다)"""
+        request: list = [{"ticket": str(uuid.uuid4())}]
+        request.extend({"type": ch, "codes": list(self.symbols), "isOnlyRealtime": True} for ch in self.channels)
+        request.append({"format": "DEFAULT"})
+        return json.dumps(request)
 
-    def connect(self) -> bool:
-        """웹소켓 연결"""
+    async def connect(self) -> bool:
+        """웹소켓 연결 및 구독 요청"""
         try:
-            if self.wm:
-                self.wm.close()
-            
-            # 채널별 WebSocketManager 생성
-            if "ticker" in self.channels:
-                self.wm = pyupbit.WebSocketManager("ticker", self.symbols)
-            elif "orderbook" in self.channels:
-                self.wm = pyupbit.WebSocketManager("orderbook", self.symbols)
-            else:
-                self.wm = pyupbit.WebSocketManager("ticker", self.symbols)
-            
-            self.last_heartbeat = time.time()
-            self.is_connected = True
-            logger.info("WebSocket 연결 성공: %s, %s", self.channels, self.symbols)
-            return True
-            
+            ws = await websockets.connect(UPBIT_WS_URL, ping_interval=self.PING_INTERVAL)
+            await ws.send(self._subscribe_message())
         except Exception as exc:
             logger.error("WebSocket 연결 실패: %s", exc)
             self.is_connected = False
             return False
 
+        self._ws = ws
+        self.last_heartbeat = time.time()
+        self.is_connected = True
+        logger.info("WebSocket 연결 성공: %s, %s", self.channels, self.symbols)
+        return True
+
     def disconnect(self) -> None:
-        """웹소켓 연결 해제"""
-        if self.wm:
-            try:
-                self.wm.close()
-                logger.info("WebSocket 연결 해제")
-            except Exception as exc:
-                logger.warning("WebSocket 해제 중 오류: %s", exc)
-            finally:
-                self.wm = None
-                self.is_connected = False
+        """웹소켓 연결 해제 – 어느 스레드에서 호출해도 이벤트 루프 쪽에서 닫힌다"""
+        ws, loop = self._ws, self._loop
+        self.is_connected = False
+        if ws is None or loop is None or loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(ws.close(), loop)
+            logger.info("WebSocket 연결 해제")
+        except Exception as exc:
+            logger.warning("WebSocket 해제 중 오류: %s", exc)
 
     def check_heartbeat(self) -> bool:
         """heartbeat 체크 - 일정 시간 이상 데이터가 없으면 False 반환"""
         return (time.time() - self.last_heartbeat) < self.heartbeat_timeout
 
-    def get_data(self) -> Optional[dict]:
-        """데이터 수신 (None이면 데이터 없음)"""
-        if not self.wm or not self.is_connected:
-            return None
-            
+    async def _receive(self, ws, market_queue: Queue) -> None:
+        """연결이 닫힐 때까지 프레임을 파싱하여 market_queue 에 넣는다
+
+        메시지마다 큐 잠금을 잡지 않도록 CORK_SIZE 개 또는 CORK_WINDOW 초 단위로 모아
+        리스트 하나로 넣는다 (market_queue 의 항목은 메시지 dict 리스트).
+        """
+        loop = asyncio.get_running_loop()
+        pending: list = []
+        timer: Optional[asyncio.TimerHandle] = None
+
+        def _flush() -> None:
+            nonlocal pending, timer
+            if timer is not None:
+                timer.cancel()
+                timer = None
+            if not pending:
+                return
+            batch, pending = pending, []
+            # 가득 차면 새 배치를 버리고 개수만 집계 (추가 큐 연산 없음)
+            try:
+                market_queue.put_nowait(batch)
+            except Full:
+                self.dropped += len(batch)
+                if self.dropped >= self._next_drop_log:
+                    self._next_drop_log = self.dropped + self.DROP_LOG_EVERY
+                    logger.warning("큐 포화로 메시지 드롭 (누적 %d건)", self.dropped)
+
         try:
-            data = self.wm.get()
-            if data is not None:
+            async for raw in ws:
                 self.last_heartbeat = time.time()
-            return data
-        except Exception as exc:
-            logger.warning("데이터 수신 중 오류: %s", exc)
-            self.is_connected = False
-            return None
+                pending.append(json_loads(raw))
+                if len(pending) >= self.CORK_SIZE:
+                    _flush()
+                elif timer is None:
+                    timer = loop.call_later(self.CORK_WINDOW, _flush)
+        finally:
+            _flush()
 
-    def run_with_reconnect(self, market_queue: Queue, stop_event: threading.Event, 
-                          max_retries: int = -1, backoff_base: float = 1.0, 
-                          max_backoff: float = 32.0) -> None:
-        """자동 재연결을 지원하는 메인 실행 루프"""
-        
+    async def _watchdog(self, ws, stop_event: threading.Event) -> None:
+        """종료 요청 또는 heartbeat 타임아웃 시 연결을 닫아 _receive 를 끝낸다"""
+        while not stop_event.is_set():
+            await asyncio.sleep(self.WATCHDOG_INTERVAL)
+            if not self.check_heartbeat():
+                logger.warning("Heartbeat 타임아웃 - 재연결 필요")
+                break
+        await ws.close()
+
+    async def _run(self, market_queue: Queue, stop_event: threading.Event,
+                   max_retries: int, backoff_base: float, max_backoff: float) -> None:
+        self._loop = asyncio.get_running_loop()
         retry_count = 0
         backoff = backoff_base
-        
+
         while not stop_event.is_set():
             # 최대 재시도 횟수 체크
             if max_retries > 0 and retry_count >= max_retries:
                 logger.error("최대 재시도 횟수 초과: %d", max_retries)
                 break
-            
+
             # 연결 시도
-            if not self.is_connected:
-                if not self.connect():
-                    retry_count += 1
-                    logger.warning("재연결 실패 (%d/%s), %s초 후 재시도", 
-                                 retry_count, max_retries if max_retries > 0 else "∞", backoff)
-                    time.sleep(backoff)
-                    backoff = min(backoff * 2, max_backoff)
-                    continue
-                else:
-                    # 연결 성공 시 백오프 리셋
-                    retry_count = 0
-                    backoff = backoff_base
-            
-            # 데이터 수신 및 처리
+            if not await self.connect():
+                retry_count += 1
+                logger.warning("재연결 실패 (%d/%s), %s초 후 재시도",
+                             retry_count, max_retries if max_retries > 0 else "∞", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, max_backoff)
+                continue
+
+            # 연결 성공 시 백오프 리셋
+            retry_count = 0
+            backoff = backoff_base
+
+            # 데이터 수신 및 처리 – 연결이 닫히면(해제/타임아웃/오류) 다음 루프에서 재연결
+            ws = self._ws
+            watchdog = asyncio.ensure_future(self._watchdog(ws, stop_event))
             try:
-                data = self.get_data()
-                
-                if data is None:
-                    # heartbeat 체크
-                    if not self.check_heartbeat():
-                        logger.warning("Heartbeat 타임아웃 - 재연결 필요")
-                        self.is_connected = False
-                        continue
-                    
-                    # 짧은 대기 후 다시 시도
-                    time.sleep(0.01)
-                    continue
-                
-                # 큐에 데이터 추가
-                try:
-                    market_queue.put_nowait(data)
-                except Exception:
-                    # 큐가 가득 차면 가장 오래된 데이터를 버린다
-                    if not market_queue.empty():
-                        try:
-                            market_queue.get_nowait()
-                            market_queue.put_nowait(data)
-                        except Exception as exc:
-                            logger.warning("큐 처리 중 오류: %s", exc)
-                            
-            except KeyboardInterrupt:
-                logger.info("사용자 중단 요청")
-                break
+                await self._receive(ws, market_queue)
             except Exception as exc:
                 logger.error("예상치 못한 오류: %s", exc)
+                await asyncio.sleep(1.0)  # 짧은 대기 후 재연결 시도
+            finally:
+                watchdog.cancel()
+                self._ws = None
                 self.is_connected = False
-                time.sleep(1.0)  # 짧은 대기 후 재연결 시도
-        
-        # 정리
-        self.disconnect()
-        logger.info("WebSocket 클라이언트 종료")
+                await ws.close()
+
+    def run_with_reconnect(self, market_queue: Queue, stop_event: threading.Event,
+                          max_retries: int = -1, backoff_base: float = 1.0,
+                          max_backoff: float = 32.0) -> None:
+        """자동 재연결을 지원하는 메인 실행 루프 (호출 스레드에서 asyncio 이벤트 루프를 구동)"""
+        try:
+            asyncio.run(self._run(market_queue, stop_event, max_retries, backoff_base, max_backoff))
+        except KeyboardInterrupt:
+            logger.info("사용자 중단 요청")
+        finally:
+            self._loop = None
+            logger.info("WebSocket 클라이언트 종료")
 
     @staticmethod
     def run(symbol: str, market_queue: Queue, stop_event: threading.Event) -> None:
@@ -155,16 +198,13 @@ class WebSocketClient:
     def update_symbols(self, symbols: list[str]) -> None:
         """구독 심볼 리스트를 동적으로 교체한다.
 
-        현재 pyupbit.WebSocketManager 는 subscribe/unsubscribe API 를 직접 제공하지 않으므로
-        내부 연결을 재설정하는 방식으로 구현한다.
-        호출 시 self.symbols 를 갱신하고 다음 루프에서 재연결하도록 is_connected 를 False 로 설정한다.
+        업비트 구독 요청은 연결 단위이므로 self.symbols 를 갱신한 뒤 현재 연결을 닫아
+        재연결 루프가 새 심볼로 다시 구독하게 한다.
         """
         if set(symbols) == set(self.symbols):
             return  # 변경 없음
 
         logger.info("WebSocketClient symbols 업데이트: %s → %s", self.symbols, symbols)
         self.symbols = symbols
-        # 다음 루프에서 재연결되도록 플래그 변경
-        self.is_connected = False
         # 즉시 disconnect 해서 빠르게 반영
-        self.disconnect() 
\ No newline at end of file
+        self.disconnect()
@@ -1,9 +1,10 @@
 from __future__ import annotations
 import sqlite3
+import time
 from pathlib import Path
 from threading import Event
 from queue import Queue, Empty
-from datetime import datetime
+from typing import List, Tuple
 
 from config.settings import BASE_DIR
 from src.utils.logger import get_logger
@@ -20,7 +21,7 @@ class DBWriter:
     TABLE_SCHEMA = (
         "CREATE TABLE IF NOT EXISTS trade_log ("
         "id INTEGER PRIMARY KEY AUTOINCREMENT, "
-        "timestamp TEXT, "
+        "timestamp INTEGER, "  # epoch milliseconds (UTC)
         "side TEXT, "
         "price REAL, "
         "volume REAL)"
@@ -28,27 +29,98 @@ class DBWriter:
 
     @staticmethod
     def _get_conn() -> sqlite3.Connection:
-        conn = sqlite3.connect(DB_PATH)
+        # isolation_level=None: 암묵적 BEGIN 없이 트랜잭션을 직접 제어 (배치마다 BEGIN … COMMIT 한 번)
+        conn = sqlite3.connect(DB_PATH, isolation_level=None)
+        conn.row_factory = None
+        # WAL + synchronous=NORMAL: 배치 커밋마다 fsync 는 WAL 파일에만, 읽기는 쓰기와 동시 진행
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
         conn.execute(DBWriter.TABLE_SCHEMA)
+        DBWriter._migrate_text_timestamp(conn)
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_trade_ts ON trade_log(timestamp)")
         return conn
 
+    @staticmethod
+    def _migrate_text_timestamp(conn: sqlite3.Connection) -> None:
+        """이전 스키마(timestamp TEXT, ISO 문자열)를 epoch-ms INTEGER 컬럼으로 변환"""
+        col_types = {row[1]: row[2].upper() for row in conn.execute("PRAGMA table_info(trade_log)")}
+        if col_types.get("timestamp") != "TEXT":
+            return
+
+        logger.info("trade_log.timestamp TEXT → INTEGER(epoch ms) 마이그레이션")
+        conn.execute("BEGIN")
+        try:
+            conn.execute("ALTER TABLE trade_log RENAME TO trade_log_old")
+            conn.execute(DBWriter.TABLE_SCHEMA)
+            conn.execute(
+                "INSERT INTO trade_log (id, timestamp, side, price, volume) "
+                "SELECT id, CAST(ROUND((julianday(timestamp) - 2440587.5) * 86400000) AS INTEGER), "
+                "side, price, volume FROM trade_log_old"
+            )
+            conn.execute("DROP TABLE trade_log_old")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    INSERT_SQL = "INSERT INTO trade_log (timestamp, side, price, volume) VALUES (?, ?, ?, ?)"
+
+    # 한 트랜잭션으로 묶을 최대 건수 / 첫 메시지 이후 추가로 모을 시간(초)
+    BATCH_SIZE = 500
+    BATCH_WINDOW = 0.05
+
+    @staticmethod
+    def _to_row(msg: Tuple) -> Tuple:
+        """db_q 메시지 (ts_ns, side, symbol, price, volume) → trade_log 행
+
+        ts_ns 는 Trader 가 체결 시점에 넣은 time.time_ns() 이며, trade_log.timestamp 의 epoch-ms 로 변환한다.
+        """
+        ts_ns, side, _symbol, price, volume = msg
+        return (ts_ns // 1_000_000, side, price, volume)
+
+    @staticmethod
+    def _drain(db_q: Queue, first: Tuple) -> List[Tuple]:
+        """첫 메시지 이후 BATCH_WINDOW 동안 최대 BATCH_SIZE 건까지 모은다"""
+        batch = [first]
+        deadline = time.monotonic() + DBWriter.BATCH_WINDOW
+        while len(batch) < DBWriter.BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(db_q.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
     @staticmethod
     def run(db_q: Queue, stop_event: Event) -> None:
         conn = DBWriter._get_conn()
         cur = conn.cursor()
+        insert_sql = DBWriter.INSERT_SQL  # 같은 문자열 객체 → sqlite3 문장 캐시 적중
 
         while not stop_event.is_set():
             try:
-                ts, side, price, volume = db_q.get(timeout=1)
-                cur.execute(
-                    "INSERT INTO trade_log (timestamp, side, price, volume) VALUES (?, ?, ?, ?)",
-                    (ts if ts else datetime.utcnow().isoformat(), side, price, volume),
-                )
-                conn.commit()
+                batch = DBWriter._drain(db_q, db_q.get(timeout=1))
             except Empty:
                 continue
+
+            rows = []
+            for msg in batch:
+                try:
+                    rows.append(DBWriter._to_row(msg))
+                except Exception as exc:
+                    logger.error("DBWriter invalid message %r: %s", msg, exc)
+
+            try:
+                # N 건을 한 번의 커밋(fsync)으로 기록
+                cur.execute("BEGIN")
+                cur.executemany(insert_sql, rows)
+                cur.execute("COMMIT")
             except Exception as exc:
                 logger.exception("DBWriter error: %s", exc)
-                conn.rollback()
+                if conn.in_transaction:
+                    cur.execute("ROLLBACK")
 
-        conn.close() 
\ No newline at end of file
+        conn.close()
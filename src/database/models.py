@@ -7,9 +7,9 @@ DB_URL 은 config.db_config.DB_URL 을 참조합니다.
 """
 
 from datetime import datetime
-from typing import Generator
+from typing import Any, Generator, Iterable, Mapping
 
-from sqlalchemy import Column, DateTime, Enum, Float, Integer, String, create_engine
+from sqlalchemy import Column, DateTime, Enum, Float, Integer, String, create_engine, event
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from config.db_config import DB_URL
@@ -65,7 +65,22 @@ class Trade(Base):
 # Engine & Session
 # ---------------------------------------------------------------------------
 
-_engine = create_engine(DB_URL, echo=False, future=True)
+# 여러 쓰기 경로(스크립트·프로세스)가 커넥션을 재사용하도록 풀 크기 지정
+_engine = create_engine(DB_URL, echo=False, future=True, pool_pre_ping=True, pool_size=5, max_overflow=10)
+
+IS_SQLITE: bool = _engine.dialect.name == "sqlite"
+
+
+if IS_SQLITE:
+
+    @event.listens_for(_engine, "connect")
+    def _set_sqlite_pragma(dbapi_conn, _record) -> None:  # pragma: no cover – DB 연결 시 1회
+        """WAL 모드 – 커밋마다 DB 파일 fsync 를 피하고 읽기/쓰기 동시성 확보."""
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.close()
+
 _SessionFactory = sessionmaker(bind=_engine, autoflush=False, autocommit=False, future=True)
 
 
@@ -75,6 +90,19 @@ def init_db() -> None:
     Base.metadata.create_all(_engine)
 
 
+def bulk_insert_candles(rows: Iterable[Mapping[str, Any]]) -> None:
+    """Core INSERT + executemany 로 캔들 일괄 삽입 (ORM unit-of-work·identity map 우회).
+
+    rows 는 Candle 컬럼명을 키로 갖는 매핑이며, created_at 은 컬럼 기본값으로 채워진다.
+    """
+
+    rows = list(rows)
+    if not rows:
+        return
+    with _engine.begin() as conn:
+        conn.execute(Candle.__table__.insert(), rows)
+
+
 def get_session() -> Generator[Session, None, None]:
     """의존성 주입 형태로 사용할 세션 제너레이터 (FastAPI 스타일)."""
 
@@ -1,53 +1,55 @@
 from __future__ import annotations
 
-import time
-from collections import defaultdict, deque
-from datetime import datetime
-from multiprocessing import Event, Queue
-from typing import Dict, Deque, List
-
-import numpy as np
-import pandas as pd
+from dataclasses import dataclass
+from multiprocessing import Event
+from typing import List, Optional
 
 from config.settings import BUY_SIGNAL_PARAMS
 from src.utils.logger import get_logger
+from src.utils.buyable_set import BuyableSet
+from src.utils.tick_ring import TickRing
 
 logger = get_logger(__name__)
 
 # -------------------------------------------------------------------------------------------------
-# Helper functions – EMA, RSI 계산 (pandas 기반)
+# 종목별 지표 상태 – EMA / Wilder RSI 를 틱마다 O(1) 로 갱신
 # -------------------------------------------------------------------------------------------------
 
-def _ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
-
-
-def _rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    """상대강도지수(RSI) – pandas 활용"""
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    rs = avg_gain / (avg_loss + 1e-9)
-    return 100 - (100 / (1 + rs))
+@dataclass
+class IndicatorState:
+    """종목별 증분 지표 상태"""
+    ema_fast: float = 0.0
+    ema_slow: float = 0.0
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    prev_price: float = 0.0
+    count: int = 0  # 지금까지 반영한 틱 수
+    moved: bool = True  # 마지막 신호 평가 이후 가격 변화 여부
+    stable: bool = False  # 마지막 평가 시점에 '가격 고정 시 신호 불변' 조건을 만족했는지
+    buyable: Optional[bool] = None  # 직전 평가 결과 (None: 아직 평가 전)
 
 
 class IndicatorWorker:  # pylint: disable=too-few-public-methods
-    """실시간 Tick Queue 를 소비하며 매수 가능한 심볼을 판단하여 공유 dict 에 업데이트"""
-
-    MAX_TICKS = 1000  # per-market 버퍼 길이
-
-    def __init__(self, tick_q: Queue, buyable_symbols: Dict[str, bool], shutdown_ev: Event):
+    """실시간 틱 링 버퍼를 소비하며 매수 가능한 심볼을 판단하여 공유 플래그 배열에 업데이트
+
+    워커마다 전용 틱 링을 읽는다. WebSocket 프로세스가 partition_of(market, 워커 수) 로 종목별 링을 골라
+    기록하므로 각 워커는 서로 겹치지 않는 종목만 받는다.
+    """
+
+    def __init__(
+        self,
+        tick_q: TickRing,
+        buyable_symbols: BuyableSet,
+        shutdown_ev: Event,
+        worker_index: int = 0,
+    ):
         self.tick_q = tick_q
+        self.worker_index = worker_index
         self.buyable_symbols = buyable_symbols
         self.shutdown_ev = shutdown_ev
 
-        # market ➜ deque[float] (최근 가격 라인)
-        self._price_buffers: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.MAX_TICKS))
-
-        # 캐시된 buy 여부 (직전 상태)
-        self._prev_buyable: Dict[str, bool] = {}
+        # TickRing symbol_id ➜ 증분 지표 상태 (문자열 해시 없이 리스트 인덱싱, 담당 외 종목은 None)
+        self._states: List[Optional[IndicatorState]] = []
 
         # 파라미터 로드
         self.ema_fast = BUY_SIGNAL_PARAMS.get("ema_fast", 20)
@@ -55,68 +57,128 @@ class IndicatorWorker:  # pylint: disable=too-few-public-methods
         self.rsi_period = BUY_SIGNAL_PARAMS.get("rsi_period", 14)
         self.rsi_oversold = BUY_SIGNAL_PARAMS.get("rsi_oversold", 30.0)
 
+        # EMA 평활 계수 / Wilder 가중치 / 신호 평가 전 워밍업 틱 수 – 틱마다 나눗셈하지 않도록 미리 계산
+        self._alpha_fast = 2.0 / (self.ema_fast + 1)
+        self._alpha_slow = 2.0 / (self.ema_slow + 1)
+        self._inv_period = 1.0 / self.rsi_period
+        self._wilder_w = (self.rsi_period - 1) / self.rsi_period
+        self._warmup = max(self.ema_slow, self.rsi_period) + 5
+
     # ------------------------------------------------------------------
     # Public
     # ------------------------------------------------------------------
 
     def run(self) -> None:  # pragma: no cover – 프로세스 메인 루프
-        logger.info("IndicatorWorker 프로세스 시작 – 매수 신호 파라미터=%s", BUY_SIGNAL_PARAMS)
+        logger.info("IndicatorWorker[%d] 프로세스 시작 – 매수 신호 파라미터=%s", self.worker_index, BUY_SIGNAL_PARAMS)
         while not self.shutdown_ev.is_set():
             try:
-                tick = self.tick_q.get(timeout=0.5)
+                prices = self.tick_q.get_price_ids(timeout=0.5)
             except Exception:
                 continue
 
-            market = tick.get("market") or tick.get("code")
-            if market is None:
-                continue
-            price = tick.get("trade_price") or tick.get("price")
-            if price is None:
-                continue
-
-            self._price_buffers[market].append(float(price))
-
-            # 신호 평가 (충분한 데이터가 있을 때만)
-            buf = self._price_buffers[market]
-            if len(buf) < max(self.ema_slow, self.rsi_period) + 5:
-                continue
-
-            try:
-                buyable = self._is_buy_signal(list(buf))
-            except Exception as exc:  # pragma: no cover – 방어적
-                logger.warning("Buy signal calc error (%s): %s", market, exc)
-                continue
-
-            prev_state = self._prev_buyable.get(market)
-            if prev_state is None or prev_state != buyable:
-                # 상태 변경 시 dict 업데이트
-                if buyable:
-                    self.buyable_symbols[market] = True  # 값은 의미 없고 key 존재 여부로 사용
-                else:
-                    self.buyable_symbols.pop(market, None)
-                self._prev_buyable[market] = buyable
-                logger.debug("[Indicator] %s buyable=%s", market, buyable)
+            # 배치 내 틱은 모두 지표 상태에 반영하고, 매수 신호 평가는 종목당 한 번만 수행
+            on_price = self._on_price
+            touched = {on_price(symbol_id, price) for symbol_id, price in prices}
+            evaluate = self._evaluate
+            for symbol_id in touched:
+                evaluate(symbol_id)
 
-        logger.info("IndicatorWorker 프로세스 종료")
+        logger.info("IndicatorWorker[%d] 프로세스 종료", self.worker_index)
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
-    def _is_buy_signal(self, prices: List[float]) -> bool:
+    def _on_price(self, symbol_id: int, price: float) -> int:
+        """(symbol_id, price) 하나를 지표 상태에 반영하고 symbol_id 를 반환
+
+        TickRing 이 symbol_id/trade_price 를 정규화해 주므로 키 탐색·None 검사가 필요 없다.
+        """
+        states = self._states
+        if symbol_id >= len(states):
+            states.extend([None] * (symbol_id + 1 - len(states)))
+        state = states[symbol_id]
+        if state is None:
+            state = states[symbol_id] = IndicatorState()
+        self._update_state(state, price)
+        return symbol_id
+
+    def _evaluate(self, symbol_id: int) -> None:
+        """현재 지표 상태로 매수 가능 여부를 판단하고 변화가 있을 때만 공유 플래그 배열에 기록"""
+        state = self._states[symbol_id]
+
+        # 신호 평가 (충분한 데이터가 있을 때만)
+        if state.count < self._warmup:
+            return
+
+        prev_state = state.buyable
+
+        # 직전 평가 이후 가격이 한 번도 움직이지 않았고 그 평가 시점에 EMA 대소가 고정된 상태였다면 결과가 같으므로 생략
+        if not state.moved and state.stable and prev_state is not None:
+            return
+
+        buyable = self._is_buy_signal(state)
+
+        # 가격이 그대로면 RSI 는 변하지 않고 두 EMA 는 같은 가격으로 수렴할 뿐이다. 빠른 EMA 가 같은 쪽에서
+        # 느린 EMA 보다 가격에서 더 멀리 있지 않으면, 가격이 움직이기 전까지 두 선의 대소는 바뀌지 않는다.
+        d_fast = state.ema_fast - state.prev_price
+        d_slow = state.ema_slow - state.prev_price
+        state.stable = d_fast * d_slow <= 0 or abs(d_fast) <= abs(d_slow)
+        state.moved = False
+
+        if prev_state is None or prev_state != buyable:
+            # 상태 변경 시 플래그 업데이트 (BuyableSet 도 symbol_id 로 인덱싱)
+            self.buyable_symbols.set_id(symbol_id, buyable)
+            state.buyable = buyable
+            logger.debug("[Indicator] %s buyable=%s", self.tick_q.market_of(symbol_id), buyable)
+
+    def _update_state(self, state: IndicatorState, price: float) -> None:
+        """가격 하나로 EMA(adjust=False) 와 Wilder RSI 평균을 갱신"""
+        state.count += 1
+        if state.count == 1:
+            # 첫 가격으로 EMA 시드
+            state.ema_fast = state.ema_slow = price
+            state.prev_price = price
+            return
+
+        state.ema_fast += self._alpha_fast * (price - state.ema_fast)
+        state.ema_slow += self._alpha_slow * (price - state.ema_slow)
+
+        delta = price - state.prev_price
+        state.prev_price = price
+        if delta:
+            state.moved = True
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        n_deltas = state.count - 1
+        if n_deltas <= self.rsi_period:
+            # 처음 period 개 변화량은 단순평균으로 시드
+            state.avg_gain += (gain - state.avg_gain) / n_deltas
+            state.avg_loss += (loss - state.avg_loss) / n_deltas
+        else:
+            wilder_w = self._wilder_w
+            inv_period = self._inv_period
+            state.avg_gain = state.avg_gain * wilder_w + gain * inv_period
+            state.avg_loss = state.avg_loss * wilder_w + loss * inv_period
+
+    def _is_buy_signal(self, state: IndicatorState) -> bool:
         """EMA & RSI 기반 매수 조건 판단"""
-        ser = pd.Series(prices)
-        ema_fast = _ema(ser, self.ema_fast).iloc[-1]
-        ema_slow = _ema(ser, self.ema_slow).iloc[-1]
-        rsi_val = _rsi(ser, self.rsi_period).iloc[-1]
+        rs = state.avg_gain / (state.avg_loss + 1e-9)
+        rsi_val = 100 - (100 / (1 + rs))
 
-        return (ema_fast > ema_slow) and (rsi_val < self.rsi_oversold)
+        return (state.ema_fast > state.ema_slow) and (rsi_val < self.rsi_oversold)
 
 
 # ----------------------------------------------------------------------------------------------
 # Process entrypoint wrapper – 다른 프로세스에서 import 없이 사용하기 위함
 # ----------------------------------------------------------------------------------------------
 
-def indicator_worker_process(tick_q: Queue, buyable_symbols: Dict[str, bool], shutdown_ev: Event):  # pragma: no cover
-    worker = IndicatorWorker(tick_q, buyable_symbols, shutdown_ev)
+def indicator_worker_process(
+    tick_q: TickRing,
+    buyable_symbols: BuyableSet,
+    shutdown_ev: Event,
+    worker_index: int = 0,
+):  # pragma: no cover
+    worker = IndicatorWorker(tick_q, buyable_symbols, shutdown_ev, worker_index)
     worker.run() 
\ No newline at end of file
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import time
 from multiprocessing import Event, Queue
+from typing import Optional, Tuple
 
 from src.api.upbit_api import UpbitAPI
 from src.utils.errors import UpbitAPIError
@@ -10,11 +11,20 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-def api_process(order_q: Queue, resp_q: Queue, notify_q: Queue, shutdown_ev: Event) -> None:  # pragma: no cover
-    """주문/조회 요청을 받아 Upbit API 를 호출하는 별도 프로세스"""
+def api_process(
+    order_q: Queue,
+    resp_q: Queue,
+    notify_q: Queue,
+    shutdown_ev: Event,
+    credentials: Optional[Tuple[str | None, str | None]] = None,
+) -> None:  # pragma: no cover
+    """주문/조회 요청을 받아 Upbit API 를 호출하는 별도 프로세스
+
+    credentials 는 부모 프로세스에서 해석한 (access_key, secret_key) 로, 전달되면 자식에서 설정을 다시 읽지 않는다.
+    """
 
     try:
-        api = UpbitAPI()
+        api = UpbitAPI(*(credentials or ()))
     except UpbitAPIError as exc:
         logger.error("Upbit API 초기화 실패: %s", exc)
         notify_q.put(f"API Init Error: {exc}")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import time
 from multiprocessing import Event, Queue
+from typing import Optional, Tuple
 
 from src.utils.notification import TelegramBot
 from src.utils.logger import get_logger
@@ -10,9 +11,18 @@ logger = get_logger(__name__)
 
 
 # pylint: disable=invalid-name
-def telegram_process(cmd_q: Queue, tg_q: Queue, shutdown_ev: Event):
-    """별도 프로세스에서 telegram bot polling"""
+def telegram_process(
+    cmd_q: Queue,
+    tg_q: Queue,
+    shutdown_ev: Event,
+    credentials: Optional[Tuple[str | None, int | None]] = None,
+):
+    """별도 프로세스에서 telegram bot polling
+
+    credentials 는 부모 프로세스에서 해석한 (token, chat_id) 이다.
+    """
 
     logger.info("Telegram 프로세스 시작")
-    TelegramBot.run(command_q=cmd_q, notify_q=tg_q, stop_event=shutdown_ev)  # 재사용
+    token, chat_id = credentials or (None, None)
+    TelegramBot.run(command_q=cmd_q, notify_q=tg_q, stop_event=shutdown_ev, token=token, chat_id=chat_id)  # 재사용
     logger.info("Telegram 프로세스 종료") 
\ No newline at end of file
@@ -4,12 +4,13 @@ from multiprocessing import Event, Queue
 
 from src.trading.trader import Trader
 from src.utils.logger import get_logger
+from src.utils.tick_ring import TickRing
 
 logger = get_logger(__name__)
 
 
 def trader_process(
-    tick_q: Queue,
+    tick_ring: TickRing,
     command_q: Queue,
     notify_q: Queue,
     db_q: Queue,
@@ -22,7 +23,7 @@ def trader_process(
 
     logger.info("Trader 프로세스 시작: 전략=%s", strategy_name)
     try:
-        Trader.run(tick_q, command_q, notify_q, db_q, order_q, resp_q, shutdown_ev, strategy_name)
+        Trader.run(tick_ring, command_q, notify_q, db_q, order_q, resp_q, shutdown_ev, strategy_name)
     except Exception as exc:  # pragma: no cover
         logger.exception("Trader 프로세스 예외: %s", exc)
     finally:
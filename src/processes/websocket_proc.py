@@ -1,14 +1,17 @@
 from __future__ import annotations
 
 import time
+from operator import itemgetter
 from multiprocessing import Event, Queue
-from typing import List, Dict
+from typing import List, Dict, Sequence
 import threading
 
-from queue import Empty
+from queue import Empty, Queue as ThreadQueue
 
 from src.api.websocket import WebSocketClient
 from src.utils.logger import get_logger
+from src.strategy.tick import KIND_ORDERBOOK, KIND_TICKER
+from src.utils.tick_ring import TickRing, partition_of
 from config.settings import (
     WEBSOCKET_CHANNELS, 
     WEBSOCKET_MAX_RETRIES, 
@@ -18,71 +21,82 @@ from config.settings import (
 
 logger = get_logger(__name__)
 
+# 최우선 호가 (bid_price, ask_price) 를 C 레벨에서 한 번에 꺼내는 추출기
+_best_quote = itemgetter("bid_price", "ask_price")
+
+# 메인 루프가 shutdown_ev 확인 없이 한 번에 처리할 최대 메시지 수
+WS_BATCH = 256
+
 
 def websocket_process(
     symbols: List[str],
-    tick_queues: Dict[str, Queue],
+    tick_ring: TickRing,
+    worker_rings: Sequence[TickRing],
     shutdown_ev: Event,
     symbols_event_q: Queue,
-    symbols_updated_ev: Event,
 ) -> None:  # pragma: no cover
-    """다중 심볼을 한 세션으로 구독하여 개별 tick_queues 로 분배하고, 실시간 심볼 변경을 처리한다."""
+    """다중 심볼을 한 세션으로 구독하여 공유 메모리 틱 링 버퍼(tick_ring)에 기록하고, 실시간 심볼 변경을 처리한다.
 
-    logger.info("WebSocket 프로세스 시작 – symbols=%s, 채널=%s", symbols, WEBSOCKET_CHANNELS)
+    각 틱은 IndicatorWorker 용 링(worker_rings) 중 partition_of(market) 로 고른 하나에도 기록한다.
+    """
 
-    ws_queue: Queue = Queue(maxsize=5000)
-
-    # 클라이언트 레퍼런스 저장용
-    clients: Dict[str, WebSocketClient] = {}
+    logger.info("WebSocket 프로세스 시작 – symbols=%s, 채널=%s", symbols, WEBSOCKET_CHANNELS)
 
-    # ---------------- WebSocket 클라이언트 스레드 ----------------
-    def _client_thread(channel: str):
-        """채널별(WebSocketManager 타입별) 독립 실행"""
-        client = WebSocketClient([channel], symbols)
-        clients[channel] = client  # 외부 업데이트용 참조 저장
-        client.run_with_reconnect(
+    # 클라이언트 스레드 ➜ 메인 루프 전달용 (같은 프로세스 안이므로 pickle·feeder 스레드가 없는 스레드 큐 사용)
+    # 항목은 메시지 리스트(최대 WebSocketClient.CORK_SIZE 개)
+    ws_queue: ThreadQueue = ThreadQueue(maxsize=5000)
+
+    # market ➜ 담당 IndicatorWorker 링 (종목당 한 번만 해시)
+    n_workers = len(worker_rings)
+    ring_of: Dict[str, TickRing] = {}
+
+    def _worker_ring(symbol: str) -> TickRing:
+        ring = ring_of.get(symbol)
+        if ring is None:
+            ring = ring_of[symbol] = worker_rings[partition_of(symbol, n_workers)]
+        return ring
+
+    # ticker/orderbook 등 모든 채널을 한 연결에서 구독하는 단일 클라이언트 (asyncio 루프는 전용 스레드에서 구동)
+    client = WebSocketClient(list(WEBSOCKET_CHANNELS), symbols)
+    client_th = threading.Thread(
+        target=client.run_with_reconnect,
+        kwargs=dict(
             market_queue=ws_queue,
             stop_event=shutdown_ev,
             max_retries=WEBSOCKET_MAX_RETRIES,
             backoff_base=WEBSOCKET_BACKOFF_BASE,
             max_backoff=WEBSOCKET_MAX_BACKOFF,
-        )
+        ),
+        daemon=True,
+        name="WS-Client",
+    )
+    client_th.start()
 
-    # ticker/orderbook 각 채널에 대해 스레드 생성
-    threads: list[threading.Thread] = []
-    for ch in WEBSOCKET_CHANNELS:
-        th = threading.Thread(target=_client_thread, args=(ch,), daemon=True, name=f"WS-{ch}")
-        th.start()
-        threads.append(th)
-
-    # ---------------- symbols_updated listener ----------------
+    # ---------------- symbols_event_q listener ----------------
     current_symbols = set(symbols)
 
     def _listener():
-        """Event + Queue 조합으로 심볼 변경을 수신하고 클라이언트에 반영"""
+        """symbols_event_q 를 blocking 으로 기다렸다가 심볼 변경을 클라이언트에 반영 (None 은 종료 신호)"""
         nonlocal current_symbols
-        from queue import Empty as _Empty  # 지역 import로 의존 최소화
 
-        while not shutdown_ev.is_set():
-            # Event 대기 – 설정되지 않으면 0.5초마다 확인
-            if not symbols_updated_ev.wait(timeout=0.5):
+        while True:
+            try:
+                latest_syms: List[str] | None = symbols_event_q.get(timeout=1.0)
+            except Empty:
+                if shutdown_ev.is_set():
+                    break
                 continue
+            if latest_syms is None:
+                break
 
-            # 다른 리스너들을 위해 바로 클리어
-            symbols_updated_ev.clear()
-
-            # 큐에 누적된 최신 심볼 목록을 모두 소비하되 마지막 값만 사용
-            latest_syms: List[str] | None = None
-            while True:
-                try:
+            # 연달아 쌓인 갱신은 마지막 값만 의미가 있으므로, 하나를 받은 뒤에만 남은 것을 비운다
+            try:
+                while True:
                     latest_syms = symbols_event_q.get_nowait()
-                except _Empty:
-                    break
-                except Exception:
-                    break
-
-            if latest_syms is None:
-                continue
+                    if latest_syms is None:
+                        return
+            except Empty:
+                pass
 
             new_set = set(latest_syms)
             if new_set == current_symbols:
@@ -91,65 +105,90 @@ def websocket_process(
             logger.info("[WebSocket] 심볼 업데이트 수신: %s → %s", list(current_symbols), latest_syms)
             current_symbols = new_set
 
-            # 클라이언트별 업데이트
-            for cl in clients.values():
-                try:
-                    cl.update_symbols(list(current_symbols))
-                except Exception as exc:  # pragma: no cover
-                    logger.warning("Client update_symbols error: %s", exc)
+            try:
+                client.update_symbols(list(current_symbols))
+            except Exception as exc:  # pragma: no cover
+                logger.warning("Client update_symbols error: %s", exc)
 
     listener_th = threading.Thread(target=_listener, daemon=True, name="WS-SymbolListener")
     listener_th.start()
 
-    while not shutdown_ev.is_set():
+    # ---------------- 메시지 ➜ 틱 링 버퍼 ----------------
+    def _dispatch(data: dict, out: list) -> None:
+        """메시지 하나에서 필요한 필드만 꺼내 out 에 틱 튜플로 추가 (배치 끝에 put_many 로 일괄 기록)"""
+        # data 는 dict 형태, 대부분 code 필드에 심볼이 있으므로 __getitem__ 우선
         try:
-            data = ws_queue.get(timeout=0.5)
-        except Empty:
-            continue
+            symbol = data["code"]
+        except KeyError:
+            symbol = data.get("market")
+        if symbol not in current_symbols:
+            # 구독 해제된 심볼이면 가공 전에 바로 무시 (로컬 set 조회만 수행)
+            return
+
+        try:
+            if data.get("type") == "orderbook":
+                # ---------------- ORDERBOOK: 최우선 호가만 추출 ----------------
+                units = data.get("orderbook_units")
+                if not units:
+                    return
+                try:
+                    best_bid, best_ask = _best_quote(units[0])
+                except KeyError:
+                    return
+                if best_bid is None or best_ask is None:
+                    return
+                # BaseStrategy 에서 price 가 필요하므로 중간값을 trade_price 로 사용
+                out.append((
+                    symbol,
+                    KIND_ORDERBOOK,
+                    (best_bid + best_ask) / 2,
+                    0.0,
+                    data.get("timestamp"),
+                    best_bid,
+                    best_ask,
+                ))
+            else:
+                price = data.get("trade_price")
+                if price is None:
+                    return
+                out.append((symbol, KIND_TICKER, price, data.get("trade_volume"), data.get("timestamp"), 0.0, 0.0))
         except Exception as exc:  # pragma: no cover
-            logger.warning("ws_queue error: %s", exc)
-            continue
+            logger.warning("tick parse error (%s): %s", symbol, exc)
 
-        # data 는 dict 형태, market 혹은 code 필드에 심볼이 있음
-        symbol = data.get("code") or data.get("market")
-        if not symbol:
+    # 첫 묶음만 blocking 으로 기다리고, 이미 쌓인 묶음은 메시지 WS_BATCH 개까지 대기 없이 모아 한 번에 기록
+    # (ws_queue 항목은 클라이언트가 CORK_SIZE 단위로 모은 메시지 리스트)
+    ws_get = ws_queue.get
+    ws_get_nowait = ws_queue.get_nowait
+    ring_put_many = tick_ring.put_many
+    while not shutdown_ev.is_set():
+        try:
+            messages = ws_get(timeout=0.5)
+        except Empty:
             continue
 
-        # ---------------- ORDERBOOK 데이터 가공 ----------------
-        if data.get("type") == "orderbook":
-            units = data.get("orderbook_units", [])
-            if units:
-                best_bid = units[0].get("bid_price")
-                best_ask = units[0].get("ask_price")
-                if best_bid is not None and best_ask is not None:
-                    data["best_bid"] = best_bid
-                    data["best_ask"] = best_ask
-                    data["spread"] = best_ask - best_bid
-                    # BaseStrategy 에서 price 가 필요하므로 중간값을 trade_price 로 사용
-                    data["trade_price"] = (best_bid + best_ask) / 2
-
-        q = tick_queues.get(symbol)
-        if q is None:
-            # 새로운 심볼이면 무시
-            continue
+        batch: list = []
+        n_messages = len(messages)
+        for data in messages:
+            _dispatch(data, batch)
+        while n_messages < WS_BATCH:
+            try:
+                messages = ws_get_nowait()
+            except Empty:
+                break
+            n_messages += len(messages)
+            for data in messages:
+                _dispatch(data, batch)
 
-        _safe_put(q, data)
+        try:
+            # Trader 링에 먼저 기록해 symbol_id 를 공유 테이블에 등록한 뒤, 워커 링에는 담당 종목 틱만 나눠 기록
+            ring_put_many(batch)
+            parts: Dict[TickRing, list] = {}
+            for tick in batch:
+                parts.setdefault(_worker_ring(tick[0]), []).append(tick)
+            for ring, part in parts.items():
+                ring.put_many(part)
+        except Exception as exc:  # pragma: no cover
+            logger.warning("tick ring put error: %s", exc)
 
     logger.info("WebSocket 프로세스 종료")
 
-
-# ---------------------------------------------------------------------------
-# 내부 헬퍼
-# ---------------------------------------------------------------------------
-
-
-def _safe_put(q: Queue, item):
-    """큐가 가득 찼을 때 가장 오래된 항목을 버리고 item을 넣는다."""
-    try:
-        q.put_nowait(item)
-    except Exception:
-        try:
-            q.get_nowait()
-            q.put_nowait(item)
-        except Exception:
-            pass 
\ No newline at end of file
@@ -2,7 +2,8 @@ from __future__ import annotations
 from collections import deque
 from typing import Dict, Any, Optional, List
 
-from .base_strategy import BaseStrategy, PositionType
+from .base_strategy import BaseStrategy, NONE_SIGNAL, POS_LONG, POS_NONE
+from .tick import TickView
 from .trailing_stop_mixin import TrailingStopMixin
 
 
@@ -18,29 +19,31 @@ class AdvancedScalpingStrategy(TrailingStopMixin, BaseStrategy):
         self.stop_loss_pct = config.get("stop_loss_pct", 1.2) if config else 1.2
         
         # 상태 변수
-        self.prices: deque[float] = deque(maxlen=self.window)
+        # 윈도 최저가용 단조 증가 deque – (틱 번호, 가격), 맨 앞이 현재 윈도의 최저가
+        # 진입 판단에는 최저가만 필요하므로 가격 버퍼 없이 누적 틱 수(_tick_no)만 센다
+        self._min_q: deque[tuple[int, float]] = deque()
+        self._tick_no = 0
 
     def _prepare_indicators(self, historical_data: Optional[List[Dict]] = None) -> None:
         """지표 초기화"""
-        self.prices.clear()
+        self._min_q.clear()
+        self._tick_no = 0
         
         if historical_data:
             for data in historical_data[-self.window:]:
                 price = data.get("trade_price") or data.get("close")
                 if price:
-                    self.prices.append(float(price))
+                    self._push_price(float(price))
 
-    def _process_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_tick(self, tick: TickView, current_price: float) -> Dict[str, Any]:
         """틱 처리 로직"""
-        price = tick.get("trade_price")
-        if price is None:
-            return {"action": "none"}
+        price = current_price
+        self._push_price(price)
         
-        price = float(price)
-        self.prices.append(price)
+        position_type = self.position.position_type
         
         # 1) 포지션이 없을 때 - 매수 조건 체크
-        if self.position.position_type == PositionType.NONE:
+        if position_type is POS_NONE:
             if self._should_enter_long(price):
                 return {
                     "action": "buy",
@@ -49,7 +52,7 @@ class AdvancedScalpingStrategy(TrailingStopMixin, BaseStrategy):
                 }
         
         # 2) 포지션이 있을 때 - 매도 조건 체크
-        elif self.position.position_type == PositionType.LONG:
+        elif position_type is POS_LONG:
             # 트레일링 스탑 체크
             trailing_signal = self.update_trailing_stop(price)
             if trailing_signal:
@@ -70,23 +73,35 @@ class AdvancedScalpingStrategy(TrailingStopMixin, BaseStrategy):
                     "reason": exit_reason
                 }
         
-        return {"action": "none"}
+        return NONE_SIGNAL
 
     def _should_enter_long(self, current_price: float) -> bool:
         """매수 진입 조건"""
-        if len(self.prices) < self.window:
+        if self._tick_no < self.window:
             return False
         
         # 최근 n 틱 중 최저가 돌파 시 진입
-        min_price = min(self.prices)
+        min_price = self._min_q[0][1]
         return current_price <= min_price
 
+    def _push_price(self, price: float) -> None:
+        """윈도 최저가 deque 갱신 (분할상환 O(1))"""
+        tick_no = self._tick_no = self._tick_no + 1
+
+        min_q = self._min_q
+        while min_q and min_q[-1][1] >= price:
+            min_q.pop()
+        min_q.append((tick_no, price))
+        if min_q[0][0] <= tick_no - self.window:
+            min_q.popleft()
+
     def _should_exit_long(self, current_price: float) -> Optional[str]:
         """기본 매도 조건"""
-        if self.position.entry_price <= 0:
+        inv_entry_price = self._inv_entry_price
+        if inv_entry_price <= 0:
             return None
         
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
+        gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
         
         # 목표 수익 또는 손절 도달 (트레일링/부분청산이 활성화된 경우 더 관대하게)
         take_profit_threshold = self.take_profit_pct
@@ -132,7 +147,7 @@ class AdvancedScalpingStrategy(TrailingStopMixin, BaseStrategy):
             "window": self.window,
             "take_profit_pct": self.take_profit_pct,
             "stop_loss_pct": self.stop_loss_pct,
-            "price_buffer_size": len(self.prices),
+            "price_buffer_size": min(self._tick_no, self.window),
             "last_hold_time": self.state.get("last_hold_time", 0)
         }
         
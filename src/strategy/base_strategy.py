@@ -1,10 +1,12 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 import time
+from types import MappingProxyType
 from config.risk_config import FEE_RATE, DEFAULT_SLIPPAGE_PCT
+from .tick import TickView
 
 
 class PositionType(Enum):
@@ -14,7 +16,16 @@ class PositionType(Enum):
     SHORT = "short"
 
 
-@dataclass
+# 틱 경로 비교용 멤버 상수 – Enum 클래스 속성 조회 없이 `is` 로 비교 (Enum 멤버는 싱글턴)
+POS_NONE = PositionType.NONE
+POS_LONG = PositionType.LONG
+
+# 대기 신호 – 틱마다 새 dict 를 만들지 않도록 읽기 전용 객체 하나를 모든 전략이 재사용
+# (신호를 받는 쪽은 읽기만 한다)
+NONE_SIGNAL = MappingProxyType({"action": "none"})
+
+
+@dataclass(slots=True)
 class Position:
     """포지션 정보"""
     symbol: str
@@ -26,7 +37,7 @@ class Position:
     realized_pnl: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class OrderFill:
     """주문 체결 정보"""
     symbol: str
@@ -35,6 +46,24 @@ class OrderFill:
     volume: float
     timestamp: float
     order_id: str
+    # 포지션 증감 부호 (+1 매수 / -1 매도) – 생성 시 한 번 계산해 두고 집계 시 분기 없이 곱한다
+    side_sign: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.side_sign = 1 if self.side == "buy" else -1
+
+
+@dataclass(slots=True)
+class SymbolStats:
+    """종목별 누적 성과 – 체결마다 새 dict 를 만들지 않고 같은 객체를 갱신한다"""
+    total_trades: int = 0
+    winning_trades: int = 0
+    total_pnl: float = 0.0
+    tick_count: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0.0
 
 
 class BaseStrategy(ABC):
@@ -53,6 +82,12 @@ class BaseStrategy(ABC):
         self.is_initialized = False
         self.last_tick_time = 0.0
         self.tick_count = 0
+        # 1 / 진입가 – 청산 조건의 수익률을 틱마다 나눗셈 없이 계산 (포지션 없으면 0.0)
+        self._inv_entry_price = 0.0
+        
+        # should_buy/should_sell 호환 메서드용 직전 틱과 결과
+        self._shim_tick: TickView | dict | None = None
+        self._shim_result: Dict[str, Any] = NONE_SIGNAL
         
         # 전략별 상태 저장소
         self.state: Dict[str, Any] = {}
@@ -77,24 +112,31 @@ class BaseStrategy(ABC):
         """지표 초기화 - 각 전략에서 구현"""
         pass
     
-    def on_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def on_tick(self, tick: TickView) -> Dict[str, Any]:
         """틱 데이터 수신 시 호출"""
         if not self.is_initialized:
-            return {"action": "none"}
+            return NONE_SIGNAL
         
-        self.last_tick_time = time.time()
+        # 틱에 실린 거래소 타임스탬프(ms)를 사용 – 없을 때만 256틱마다 시계를 읽는다
         self.tick_count += 1
+        ts = tick.ts
+        if ts:
+            self.last_tick_time = ts * 1e-3
+        elif not self.tick_count & 0xFF or not self.last_tick_time:
+            self.last_tick_time = time.time()
         
-        # 현재 가격으로 미실현 손익 업데이트
-        current_price = tick.get("trade_price", 0.0)
+        # 현재 가격으로 미실현 손익 업데이트 (가격은 한 번만 꺼내 전략에 그대로 넘긴다)
+        current_price = tick.price
+        if not current_price:
+            return NONE_SIGNAL
         self._update_unrealized_pnl(current_price)
         
         # 전략별 틱 처리
-        return self._process_tick(tick)
+        return self._process_tick(tick, current_price)
     
     @abstractmethod
-    def _process_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
-        """틱 처리 로직 - 각 전략에서 구현
+    def _process_tick(self, tick: TickView, current_price: float) -> Dict[str, Any]:
+        """틱 처리 로직 - 각 전략에서 구현 (current_price 는 on_tick 이 꺼낸 tick.price)
         
         Returns:
             {"action": "buy|sell|none", "price": float, "volume": float, "reason": str}
@@ -114,6 +156,7 @@ class BaseStrategy(ABC):
         """매수 체결 처리"""
         self.position.position_type = PositionType.LONG
         self.position.entry_price = fill.price
+        self._inv_entry_price = 1.0 / fill.price if fill.price > 0 else 0.0
         self.position.volume = fill.volume
         self.position.entry_time = fill.timestamp
         self.position.unrealized_pnl = 0.0
@@ -148,6 +191,7 @@ class BaseStrategy(ABC):
         # 포지션 초기화
         self.position.position_type = PositionType.NONE
         self.position.entry_price = 0.0
+        self._inv_entry_price = 0.0
         self.position.volume = 0.0
         self.position.unrealized_pnl = 0.0
         
@@ -164,35 +208,43 @@ class BaseStrategy(ABC):
     
     def _update_unrealized_pnl(self, current_price: float) -> None:
         """미실현 손익 업데이트"""
-        if self.position.position_type == PositionType.LONG:
+        if self.position.position_type is POS_LONG:
             executed_volume = self.position.volume
             gross_pnl = (current_price - self.position.entry_price) * executed_volume
             fee_estimate = (current_price + self.position.entry_price) * executed_volume * FEE_RATE
             slippage_cost = self.position.entry_price * executed_volume * (DEFAULT_SLIPPAGE_PCT / 100)
             self.position.unrealized_pnl = gross_pnl - fee_estimate - slippage_cost
     
-    def get_position_info(self) -> Dict[str, Any]:
-        """현재 포지션 정보 반환"""
-        return {
-            "symbol": self.position.symbol,
-            "position_type": self.position.position_type.value,
-            "entry_price": self.position.entry_price,
-            "volume": self.position.volume,
-            "unrealized_pnl": self.position.unrealized_pnl,
-            "realized_pnl": self.position.realized_pnl
-        }
+    def get_position_info(self, out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """현재 포지션 정보 반환 (out 을 주면 새 dict 대신 out 을 갱신해 반환)"""
+        position = self.position
+        info = {} if out is None else out
+        info["symbol"] = position.symbol
+        info["position_type"] = position.position_type.value
+        info["entry_price"] = position.entry_price
+        info["volume"] = position.volume
+        info["unrealized_pnl"] = position.unrealized_pnl
+        info["realized_pnl"] = position.realized_pnl
+        return info
     
-    def get_performance_stats(self) -> Dict[str, Any]:
-        """성과 통계 반환"""
+    def update_performance_stats(self, stats: SymbolStats) -> None:
+        """stats 객체에 현재 누적 성과를 그대로 기록 (할당 없음)"""
+        stats.total_trades = self.total_trades
+        stats.winning_trades = self.winning_trades
+        stats.total_pnl = self.total_pnl
+        stats.tick_count = self.tick_count
+
+    def get_performance_stats(self, out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """성과 통계 반환 (out 을 주면 새 dict 대신 out 을 갱신해 반환)"""
         win_rate = (self.winning_trades / self.total_trades * 100) if self.total_trades > 0 else 0.0
         
-        return {
-            "total_trades": self.total_trades,
-            "winning_trades": self.winning_trades,
-            "win_rate": round(win_rate, 2),
-            "total_pnl": round(self.total_pnl, 2),
-            "tick_count": self.tick_count
-        }
+        stats = {} if out is None else out
+        stats["total_trades"] = self.total_trades
+        stats["winning_trades"] = self.winning_trades
+        stats["win_rate"] = round(win_rate, 2)
+        stats["total_pnl"] = round(self.total_pnl, 2)
+        stats["tick_count"] = self.tick_count
+        return stats
     
     def reset(self) -> None:
         """전략 상태 초기화"""
@@ -203,6 +255,7 @@ class BaseStrategy(ABC):
             volume=0.0,
             entry_time=0.0
         )
+        self._inv_entry_price = 0.0
         self.state.clear()
         self.is_initialized = False
         self.tick_count = 0
@@ -211,12 +264,19 @@ class BaseStrategy(ABC):
         self.total_pnl = 0.0
 
     # 기존 호환성을 위한 메서드들
-    def should_buy(self, tick: dict) -> bool:
+    def _on_tick_once(self, tick: TickView | dict) -> Dict[str, Any]:
+        """같은 틱 객체로 should_buy/should_sell 을 연달아 호출해도 on_tick 은 한 번만 실행"""
+        # id() 는 틱 객체가 해제되면 재사용될 수 있으므로 객체 자체를 보관해 동일성 비교
+        if tick is not self._shim_tick:
+            view = tick if isinstance(tick, TickView) else TickView.from_dict(tick)
+            self._shim_result = self.on_tick(view)
+            self._shim_tick = tick
+        return self._shim_result
+
+    def should_buy(self, tick: TickView | dict) -> bool:
         """매수 조건 판단 (기존 호환성)"""
-        result = self.on_tick(tick)
-        return result.get("action") == "buy"
+        return self._on_tick_once(tick).get("action") == "buy"
 
-    def should_sell(self, tick: dict) -> bool:
+    def should_sell(self, tick: TickView | dict) -> bool:
         """매도 조건 판단 (기존 호환성)"""
-        result = self.on_tick(tick)
-        return result.get("action") == "sell" 
\ No newline at end of file
+        return self._on_tick_once(tick).get("action") == "sell" 
\ No newline at end of file
@@ -2,7 +2,8 @@ from __future__ import annotations
 from collections import deque
 from typing import Dict, Any, Optional, List
 
-from .base_strategy import BaseStrategy, PositionType
+from .base_strategy import BaseStrategy, NONE_SIGNAL, POS_LONG, POS_NONE
+from .tick import TickView
 
 
 class MACrossStrategy(BaseStrategy):
@@ -17,8 +18,11 @@ class MACrossStrategy(BaseStrategy):
         self.take_profit_pct = config.get("take_profit_pct", 1.0) if config else 1.0
         self.stop_loss_pct = config.get("stop_loss_pct", 2.0) if config else 2.0
         
-        # 가격 데이터 저장
-        self.prices: deque[float] = deque(maxlen=max(self.fast_period, self.slow_period))
+        # 가격 데이터 저장 – 구간별 버퍼와 누적합으로 이동평균을 틱마다 O(1) 갱신
+        self._fast_buf: deque[float] = deque(maxlen=self.fast_period)
+        self._slow_buf: deque[float] = deque(maxlen=self.slow_period)
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
         
         # 이동평균 값들
         self.fast_ma = 0.0
@@ -28,41 +32,46 @@ class MACrossStrategy(BaseStrategy):
 
     def _prepare_indicators(self, historical_data: Optional[List[Dict]] = None) -> None:
         """지표 초기화"""
-        self.prices.clear()
+        self._fast_buf.clear()
+        self._slow_buf.clear()
+        self._fast_sum = 0.0
+        self._slow_sum = 0.0
         
         if historical_data:
-            # 과거 데이터로 이동평균 초기화
-            for data in historical_data[-self.slow_period:]:
-                price = data.get("trade_price") or data.get("close")
-                if price:
-                    self.prices.append(float(price))
-            
-            # 초기 이동평균 계산
-            if len(self.prices) >= self.slow_period:
-                self._calculate_moving_averages()
+            # 과거 데이터로 이동평균 초기화 – 버퍼를 한 번에 채우고 누적합은 sum() 한 번으로 시드
+            prices = [
+                float(price)
+                for price in ((data.get("trade_price") or data.get("close")) for data in historical_data[-self.slow_period:])
+                if price
+            ]
+            self._fast_buf.extend(prices)
+            self._slow_buf.extend(prices)
+            self._fast_sum = sum(self._fast_buf)
+            self._slow_sum = sum(self._slow_buf)
+            if len(self._fast_buf) == self.fast_period:
+                self.fast_ma = self._fast_sum / self.fast_period
+            if len(self._slow_buf) == self.slow_period:
+                self.slow_ma = self._slow_sum / self.slow_period
 
-    def _process_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_tick(self, tick: TickView, current_price: float) -> Dict[str, Any]:
         """틱 처리 로직"""
-        price = tick.get("trade_price")
-        if price is None:
-            return {"action": "none"}
-        
-        price = float(price)
+        price = current_price
         
         # 이전 이동평균 저장
         self.prev_fast_ma = self.fast_ma
         self.prev_slow_ma = self.slow_ma
         
         # 새 가격 추가 및 이동평균 계산
-        self.prices.append(price)
-        self._calculate_moving_averages()
+        self._update_moving_averages(price)
         
         # 충분한 데이터가 없으면 대기
-        if len(self.prices) < self.slow_period:
-            return {"action": "none"}
+        if len(self._slow_buf) < self.slow_period:
+            return NONE_SIGNAL
+        
+        position_type = self.position.position_type
         
         # 1) 매수 조건 체크 (골든 크로스)
-        if self.position.position_type == PositionType.NONE:
+        if position_type is POS_NONE:
             if self._is_golden_cross():
                 return {
                     "action": "buy",
@@ -71,7 +80,7 @@ class MACrossStrategy(BaseStrategy):
                 }
         
         # 2) 매도 조건 체크
-        elif self.position.position_type == PositionType.LONG:
+        elif position_type is POS_LONG:
             exit_reason = self._should_exit_long(price)
             if exit_reason:
                 return {
@@ -80,15 +89,32 @@ class MACrossStrategy(BaseStrategy):
                     "reason": exit_reason
                 }
         
-        return {"action": "none"}
+        return NONE_SIGNAL
 
-    def _calculate_moving_averages(self) -> None:
-        """이동평균 계산"""
-        if len(self.prices) >= self.fast_period:
-            self.fast_ma = sum(list(self.prices)[-self.fast_period:]) / self.fast_period
-        
-        if len(self.prices) >= self.slow_period:
-            self.slow_ma = sum(list(self.prices)[-self.slow_period:]) / self.slow_period
+    def _update_moving_averages(self, price: float) -> None:
+        """가격을 두 버퍼에 넣고 누적합으로 이동평균을 갱신 (틱당 메서드 호출 한 번)
+
+        구간을 벗어나는 가장 오래된 가격을 누적합에서 빼므로 버퍼 길이와 무관하게 O(1)이다.
+        """
+        fast_period = self.fast_period
+        fast_buf = self._fast_buf
+        fast_sum = self._fast_sum + price
+        if len(fast_buf) == fast_period:
+            fast_sum -= fast_buf[0]
+        fast_buf.append(price)
+        self._fast_sum = fast_sum
+        if len(fast_buf) == fast_period:
+            self.fast_ma = fast_sum / fast_period
+
+        slow_period = self.slow_period
+        slow_buf = self._slow_buf
+        slow_sum = self._slow_sum + price
+        if len(slow_buf) == slow_period:
+            slow_sum -= slow_buf[0]
+        slow_buf.append(price)
+        self._slow_sum = slow_sum
+        if len(slow_buf) == slow_period:
+            self.slow_ma = slow_sum / slow_period
 
     def _is_golden_cross(self) -> bool:
         """골든 크로스 확인 (빠른 MA가 느린 MA를 상향 돌파)"""
@@ -110,11 +136,12 @@ class MACrossStrategy(BaseStrategy):
 
     def _should_exit_long(self, current_price: float) -> Optional[str]:
         """매도 조건 확인"""
-        if self.position.entry_price <= 0:
+        inv_entry_price = self._inv_entry_price
+        if inv_entry_price <= 0:
             return None
         
         # 1. 손익 기준 청산
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
+        gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
         
         if gain_pct >= self.take_profit_pct:
             return f"목표 수익 달성 ({gain_pct:.2f}%)"
@@ -151,5 +178,5 @@ class MACrossStrategy(BaseStrategy):
             "current_fast_ma": round(self.fast_ma, 2),
             "current_slow_ma": round(self.slow_ma, 2),
             "ma_spread": round(self.fast_ma - self.slow_ma, 2),
-            "price_buffer_size": len(self.prices)
+            "price_buffer_size": max(len(self._fast_buf), len(self._slow_buf))
         } 
\ No newline at end of file
@@ -1,31 +1,50 @@
 from __future__ import annotations
-from collections import deque
 from typing import Dict, Any, Optional, List
 
-from .base_strategy import BaseStrategy, PositionType
+from .base_strategy import BaseStrategy, NONE_SIGNAL, POS_LONG, POS_NONE
+from .tick import TickView
+
+# RSI 구간 – 과매도(이하) / 중립 / 과매수(이상). 진입·청산 판정을 정수 비교 하나로 한다
+RSI_OVERSOLD = 0
+RSI_NEUTRAL = 1
+RSI_OVERBOUGHT = 2
 
 
 class RSIStrategy(BaseStrategy):
     """RSI 기반 과매수/과매도 전략"""
 
+    # 전략 파라미터 기본값 (config 에 없는 키만 사용)
+    DEFAULTS: Dict[str, Any] = {
+        "rsi_period": 14,
+        "oversold_level": 30,
+        "overbought_level": 70,
+        "take_profit_pct": 1.5,
+        "stop_loss_pct": 2.0,
+    }
+
     def __init__(self, symbol: str, config: Dict[str, Any] = None):
         super().__init__(symbol, config)
         
-        # 전략 파라미터
-        self.rsi_period = config.get("rsi_period", 14) if config else 14
-        self.oversold_level = config.get("oversold_level", 30) if config else 30
-        self.overbought_level = config.get("overbought_level", 70) if config else 70
-        self.take_profit_pct = config.get("take_profit_pct", 1.5) if config else 1.5
-        self.stop_loss_pct = config.get("stop_loss_pct", 2.0) if config else 2.0
-        
-        # RSI 계산용 데이터
-        self.prices: deque[float] = deque(maxlen=self.rsi_period + 1)
-        self.gains: deque[float] = deque(maxlen=self.rsi_period)
-        self.losses: deque[float] = deque(maxlen=self.rsi_period)
+        # 전략 파라미터 – 기본값과 한 번에 병합
+        cfg = {**self.DEFAULTS, **(config or {})}
+        self.rsi_period = cfg["rsi_period"]
+        self.oversold_level = cfg["oversold_level"]
+        self.overbought_level = cfg["overbought_level"]
+        self.take_profit_pct = cfg["take_profit_pct"]
+        self.stop_loss_pct = cfg["stop_loss_pct"]
+        
+        # RSI 계산용 데이터 – Wilder 재귀식은 직전 가격과 변화량 개수만 있으면 된다
+        self._last_price: Optional[float] = None
+        self._n_deltas = 0
+        # Wilder 가중치 – 틱마다 나눗셈하지 않도록 미리 계산
+        self._inv_period = 1.0 / self.rsi_period
+        self._wilder_k = (self.rsi_period - 1) / self.rsi_period
         
         # RSI 값
         self.current_rsi = 50.0
         self.prev_rsi = 50.0
+        # current_rsi 가 속한 구간 (RSI 가 바뀔 때만 다시 계산)
+        self._rsi_region = self._region_of(self.current_rsi)
         
         # 평균 계산용
         self.avg_gain = 0.0
@@ -33,37 +52,41 @@ class RSIStrategy(BaseStrategy):
 
     def _prepare_indicators(self, historical_data: Optional[List[Dict]] = None) -> None:
         """지표 초기화"""
-        self.prices.clear()
-        self.gains.clear()
-        self.losses.clear()
+        self._last_price = None
+        self._n_deltas = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
         
         if historical_data and len(historical_data) > self.rsi_period:
-            # 과거 데이터로 RSI 초기화
-            for data in historical_data[-(self.rsi_period + 10):]:
-                price = data.get("trade_price") or data.get("close")
-                if price:
-                    self._add_price(float(price))
+            # 과거 데이터로 RSI 초기화 – 가격 목록을 한 번에 만들고 로컬 변수로 Wilder 평균을 일괄 계산
+            prices = [
+                float(price)
+                for price in ((data.get("trade_price") or data.get("close")) for data in historical_data[-(self.rsi_period + 10):])
+                if price
+            ]
+            self._seed_averages(prices)
+            self._calculate_rsi()
+            self.prev_rsi = self.current_rsi
 
-    def _process_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_tick(self, tick: TickView, current_price: float) -> Dict[str, Any]:
         """틱 처리 로직"""
-        price = tick.get("trade_price")
-        if price is None:
-            return {"action": "none"}
-        
-        price = float(price)
+        price = current_price
         self.prev_rsi = self.current_rsi
+        prev_region = self._rsi_region
         
         # 새 가격 추가 및 RSI 계산
         self._add_price(price)
-        self._calculate_rsi()
         
         # 충분한 데이터가 없으면 대기
-        if len(self.gains) < self.rsi_period:
-            return {"action": "none"}
+        if self._n_deltas < self.rsi_period:
+            return NONE_SIGNAL
+        
+        position_type = self.position.position_type
         
         # 1) 매수 조건 체크 (과매도에서 반등)
-        if self.position.position_type == PositionType.NONE:
-            if self._is_oversold_reversal():
+        #    직전 RSI 가 과매도 구간에 있고 현재 RSI 가 과매도 구간을 벗어남 (벗어났다면 이미 상승한 것)
+        if position_type is POS_NONE:
+            if prev_region == RSI_OVERSOLD and self._rsi_region != RSI_OVERSOLD:
                 return {
                     "action": "buy",
                     "price": price,
@@ -71,7 +94,7 @@ class RSIStrategy(BaseStrategy):
                 }
         
         # 2) 매도 조건 체크
-        elif self.position.position_type == PositionType.LONG:
+        elif position_type is POS_LONG:
             exit_reason = self._should_exit_long(price)
             if exit_reason:
                 return {
@@ -80,64 +103,101 @@ class RSIStrategy(BaseStrategy):
                     "reason": exit_reason
                 }
         
-        return {"action": "none"}
+        return NONE_SIGNAL
 
-    def _add_price(self, price: float) -> None:
-        """가격 추가 및 gain/loss 계산"""
-        if len(self.prices) > 0:
-            price_change = price - self.prices[-1]
-            
-            if price_change > 0:
-                self.gains.append(price_change)
-                self.losses.append(0.0)
-            else:
-                self.gains.append(0.0)
-                self.losses.append(abs(price_change))
-        
-        self.prices.append(price)
+    def _seed_averages(self, prices: List[float]) -> None:
+        """과거 가격 목록으로 평균 gain/loss 를 한 번에 시드 (_add_price 를 가격마다 호출한 것과 동일한 결과)"""
+        if not prices:
+            return
+        period = self.rsi_period
+        gains = []
+        losses = []
+        for prev, price in zip(prices, prices[1:]):
+            delta = price - prev
+            gains.append(delta if delta > 0 else 0.0)
+            losses.append(-delta if delta < 0 else 0.0)
 
-    def _calculate_rsi(self) -> None:
-        """RSI 계산"""
-        if len(self.gains) < self.rsi_period:
+        self._last_price = prices[-1]
+        self._n_deltas = len(gains)
+        if len(gains) < period:
+            # 시드 구간을 다 채우지 못했으면 합계만 유지 (이후 _add_price 가 이어서 누적)
+            self.avg_gain = sum(gains)
+            self.avg_loss = sum(losses)
+            return
+
+        inv_period = self._inv_period
+        wilder_k = self._wilder_k
+        avg_gain = sum(gains[:period]) * inv_period
+        avg_loss = sum(losses[:period]) * inv_period
+        for gain, loss in zip(gains[period:], losses[period:]):
+            avg_gain = avg_gain * wilder_k + gain * inv_period
+            avg_loss = avg_loss * wilder_k + loss * inv_period
+        self.avg_gain = avg_gain
+        self.avg_loss = avg_loss
+
+    def _add_price(self, price: float) -> None:
+        """가격 추가, Wilder 평균 gain/loss 갱신, 워밍업 이후엔 RSI 까지 계산 (틱당 메서드 호출 한 번, O(1))"""
+        last_price = self._last_price
+        self._last_price = price
+        if last_price is None:
+            return
+        
+        delta = price - last_price
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        
+        n_deltas = self._n_deltas = self._n_deltas + 1
+        period = self.rsi_period
+        if n_deltas < period:
+            # 첫 period 개 변화량은 합산 후 한 번에 나눠 단순평균으로 시드
+            self.avg_gain += gain
+            self.avg_loss += loss
             return
         
-        # 첫 번째 계산 (단순 평균)
-        if self.avg_gain == 0 and self.avg_loss == 0:
-            self.avg_gain = sum(self.gains) / self.rsi_period
-            self.avg_loss = sum(self.losses) / self.rsi_period
+        inv_period = self._inv_period
+        if n_deltas == period:
+            avg_gain = (self.avg_gain + gain) * inv_period
+            avg_loss = (self.avg_loss + loss) * inv_period
         else:
             # 지수 이동평균 방식 (Wilder's smoothing)
-            latest_gain = self.gains[-1]
-            latest_loss = self.losses[-1]
-            
-            self.avg_gain = (self.avg_gain * (self.rsi_period - 1) + latest_gain) / self.rsi_period
-            self.avg_loss = (self.avg_loss * (self.rsi_period - 1) + latest_loss) / self.rsi_period
+            wilder_k = self._wilder_k
+            avg_gain = self.avg_gain * wilder_k + gain * inv_period
+            avg_loss = self.avg_loss * wilder_k + loss * inv_period
+        self.avg_gain = avg_gain
+        self.avg_loss = avg_loss
+        
+        # RSI 계산 (_calculate_rsi 와 동일 – 틱 경로에서는 호출 없이 인라인)
+        rsi = self.current_rsi = 100.0 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss))
+        self._rsi_region = self._region_of(rsi)
+
+    def _calculate_rsi(self) -> None:
+        """RSI 계산"""
+        if self._n_deltas < self.rsi_period:
+            return
         
-        # RSI 계산
         if self.avg_loss == 0:
             self.current_rsi = 100.0
         else:
             rs = self.avg_gain / self.avg_loss
             self.current_rsi = 100 - (100 / (1 + rs))
+        self._rsi_region = self._region_of(self.current_rsi)
 
-    def _is_oversold_reversal(self) -> bool:
-        """과매도에서 반등 신호 확인"""
-        # 이전 RSI가 과매도 구간에 있고, 현재 RSI가 상승 중
-        return (self.prev_rsi <= self.oversold_level and 
-                self.current_rsi > self.prev_rsi and
-                self.current_rsi > self.oversold_level)
-
-    def _is_overbought_condition(self) -> bool:
-        """과매수 조건 확인"""
-        return self.current_rsi >= self.overbought_level
+    def _region_of(self, rsi: float) -> int:
+        """RSI 값이 속한 구간 (과매도 경계는 이하, 과매수 경계는 이상을 포함)"""
+        if rsi <= self.oversold_level:
+            return RSI_OVERSOLD
+        if rsi >= self.overbought_level:
+            return RSI_OVERBOUGHT
+        return RSI_NEUTRAL
 
     def _should_exit_long(self, current_price: float) -> Optional[str]:
         """매도 조건 확인"""
-        if self.position.entry_price <= 0:
+        inv_entry_price = self._inv_entry_price
+        if inv_entry_price <= 0:
             return None
         
         # 1. 손익 기준 청산
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
+        gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
         
         if gain_pct >= self.take_profit_pct:
             return f"목표 수익 달성 ({gain_pct:.2f}%)"
@@ -145,7 +205,7 @@ class RSIStrategy(BaseStrategy):
             return f"손절 실행 ({gain_pct:.2f}%)"
         
         # 2. 과매수 청산
-        if self._is_overbought_condition():
+        if self._rsi_region == RSI_OVERBOUGHT:
             return f"과매수 청산 (RSI: {self.current_rsi:.2f})"
         
         return None
@@ -174,5 +234,5 @@ class RSIStrategy(BaseStrategy):
             "current_rsi": round(self.current_rsi, 2),
             "avg_gain": round(self.avg_gain, 4),
             "avg_loss": round(self.avg_loss, 4),
-            "price_buffer_size": len(self.prices)
+            "price_buffer_size": min(self._n_deltas + (self._last_price is not None), self.rsi_period + 1)
         } 
\ No newline at end of file
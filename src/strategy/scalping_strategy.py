@@ -3,50 +3,64 @@ from collections import deque
 from typing import Dict, Any, Optional, List
 
 from config.strategy_config import TAKE_PROFIT_PCT, STOP_LOSS_PCT
-from .base_strategy import BaseStrategy, PositionType
+from .base_strategy import BaseStrategy, NONE_SIGNAL, POS_LONG, POS_NONE
+from .tick import KIND_ORDERBOOK, TickView
 
 
 class ScalpingStrategy(BaseStrategy):
     """단순 가격 반전 기반 스캘핑 전략"""
 
+    # 전략 파라미터 기본값 (config 에 없는 키만 사용)
+    DEFAULTS: Dict[str, Any] = {
+        "window": 5,
+        "take_profit_pct": TAKE_PROFIT_PCT,
+        "stop_loss_pct": STOP_LOSS_PCT,
+        "max_allowed_spread": 1000,  # KRW 단위 허용 스프레드
+    }
+
     def __init__(self, symbol: str, config: Dict[str, Any] = None):
         super().__init__(symbol, config)
         
-        # 전략 파라미터
-        self.window = config.get("window", 5) if config else 5
-        self.take_profit_pct = config.get("take_profit_pct", TAKE_PROFIT_PCT) if config else TAKE_PROFIT_PCT
-        self.stop_loss_pct = config.get("stop_loss_pct", STOP_LOSS_PCT) if config else STOP_LOSS_PCT
+        # 전략 파라미터 – 기본값과 한 번에 병합
+        cfg = {**self.DEFAULTS, **(config or {})}
+        self.window = cfg["window"]
+        self.take_profit_pct = cfg["take_profit_pct"]
+        self.stop_loss_pct = cfg["stop_loss_pct"]
         
         # 상태 변수
-        self.prices: deque[float] = deque(maxlen=self.window)
+        # 윈도 최저가용 단조 증가 deque – (틱 번호, 가격), 맨 앞이 현재 윈도의 최저가
+        # 진입 판단에는 최저가만 필요하므로 가격 버퍼 없이 누적 틱 수(_tick_no)만 센다
+        self._min_q: deque[tuple[int, float]] = deque()
+        self._tick_no = 0
 
         # 호가 기반 필터링
-        self.max_spread = config.get("max_allowed_spread", 1000) if config else 1000  # KRW 단위 허용 스프레드
+        self.max_spread = cfg["max_allowed_spread"]
         self.best_bid: float | None = None
         self.best_ask: float | None = None
+        # 마지막 호가 기준 스프레드 허용 여부 (호가 수신 시에만 갱신, 호가 전에는 False)
+        self._spread_ok = False
 
     def _prepare_indicators(self, historical_data: Optional[List[Dict]] = None) -> None:
         """지표 초기화"""
-        self.prices.clear()
+        self._min_q.clear()
+        self._tick_no = 0
         
         # 과거 데이터가 있으면 초기화에 사용
         if historical_data:
             for data in historical_data[-self.window:]:
                 price = data.get("trade_price") or data.get("close")
                 if price:
-                    self.prices.append(float(price))
+                    self._push_price(float(price))
 
-    def _process_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_tick(self, tick: TickView, current_price: float) -> Dict[str, Any]:
         """틱 처리 로직"""
-        price = tick.get("trade_price")
-        if price is None:
-            return {"action": "none"}
+        price = current_price
+        self._push_price(price)
         
-        price = float(price)
-        self.prices.append(price)
+        position_type = self.position.position_type
         
         # 1) 매수 조건 체크
-        if self.position.position_type == PositionType.NONE:
+        if position_type is POS_NONE:
             if self._should_enter_long(price):
                 return {
                     "action": "buy",
@@ -55,45 +69,51 @@ class ScalpingStrategy(BaseStrategy):
                 }
         
         # 2) 매도 조건 체크
-        elif self.position.position_type == PositionType.LONG:
-            if self._should_exit_long(price):
+        elif position_type is POS_LONG:
+            exit_reason = self._should_exit_long(price)
+            if exit_reason:
                 return {
                     "action": "sell",
                     "price": price,
-                    "reason": self._get_exit_reason(price)
+                    "reason": exit_reason
                 }
         
-        return {"action": "none"}
+        return NONE_SIGNAL
 
     def _should_enter_long(self, current_price: float) -> bool:
         """매수 진입 조건"""
-        if len(self.prices) < self.window:
+        if self._tick_no < self.window:
             return False
         
         # 최근 n 틱 중 최저가 돌파 시 진입
-        min_price = min(self.prices)
+        min_price = self._min_q[0][1]
         return current_price <= min_price
 
-    def _should_exit_long(self, current_price: float) -> bool:
-        """매도 청산 조건"""
-        if self.position.entry_price <= 0:
-            return False
+    def _push_price(self, price: float) -> None:
+        """윈도 최저가 deque 갱신 (분할상환 O(1))"""
+        tick_no = self._tick_no = self._tick_no + 1
+
+        min_q = self._min_q
+        while min_q and min_q[-1][1] >= price:
+            min_q.pop()
+        min_q.append((tick_no, price))
+        if min_q[0][0] <= tick_no - self.window:
+            min_q.popleft()
+
+    def _should_exit_long(self, current_price: float) -> Optional[str]:
+        """매도 청산 조건 – 수익률을 한 번만 계산하여 청산 사유(없으면 None) 반환"""
+        inv_entry_price = self._inv_entry_price
+        if inv_entry_price <= 0:
+            return None
         
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
+        gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
         
         # 목표 수익 또는 손절 도달
-        return gain_pct >= self.take_profit_pct or gain_pct <= -self.stop_loss_pct
-
-    def _get_exit_reason(self, current_price: float) -> str:
-        """청산 사유 반환"""
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
-        
         if gain_pct >= self.take_profit_pct:
             return f"목표 수익 달성 ({gain_pct:.2f}%)"
         elif gain_pct <= -self.stop_loss_pct:
             return f"손절 실행 ({gain_pct:.2f}%)"
-        else:
-            return "기타"
+        return None
 
     def _on_position_opened(self, fill) -> None:
         """포지션 오픈 후 처리"""
@@ -114,7 +134,7 @@ class ScalpingStrategy(BaseStrategy):
             "take_profit_pct": self.take_profit_pct,
             "stop_loss_pct": self.stop_loss_pct,
             "max_spread": self.max_spread,
-            "price_buffer_size": len(self.prices),
+            "price_buffer_size": min(self._tick_no, self.window),
             "last_hold_time": self.state.get("last_hold_time", 0)
         }
 
@@ -122,22 +142,19 @@ class ScalpingStrategy(BaseStrategy):
     # 주문book/스프레드 필터링용 on_tick 오버라이드
     # ------------------------------------------------------------------
 
-    def on_tick(self, tick: Dict[str, Any]) -> Dict[str, Any]:
+    def on_tick(self, tick: TickView) -> Dict[str, Any]:
         """호가(orderbook) 메시지를 우선 처리한 뒤 기본 로직 호출"""
 
-        # 1) ORDERBOOK 메시지: 호가 정보만 저장
-        if tick.get("type") == "orderbook":
-            self.best_bid = tick.get("best_bid")
-            self.best_ask = tick.get("best_ask")
-            return {"action": "none"}
-
-        # 2) 스프레드가 과도하면 거래 skip
-        if self.best_bid is None or self.best_ask is None:
-            return {"action": "none"}
+        # 1) ORDERBOOK 메시지: 호가 정보 저장 후 스프레드 판정을 미리 계산
+        if tick.kind == KIND_ORDERBOOK:
+            best_bid = self.best_bid = tick.best_bid
+            best_ask = self.best_ask = tick.best_ask
+            self._spread_ok = best_ask - best_bid <= self.max_spread
+            return NONE_SIGNAL
 
-        spread = self.best_ask - self.best_bid
-        if spread > self.max_spread:
-            return {"action": "none"}
+        # 2) 호가 전이거나 스프레드가 과도하면 거래 skip
+        if not self._spread_ok:
+            return NONE_SIGNAL
 
         # 3) 정상적인 ticker → 기존 로직 진행
         return super().on_tick(tick) 
\ No newline at end of file
@@ -1,9 +1,8 @@
 from __future__ import annotations
-from typing import Dict, Any, List, Optional, Type
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 import time
-from collections import defaultdict
 
-from .base_strategy import BaseStrategy, OrderFill, PositionType
+from .base_strategy import POS_NONE, BaseStrategy, OrderFill, PositionType, SymbolStats
 from .scalping_strategy import ScalpingStrategy
 from .ma_cross_strategy import MACrossStrategy
 from .rsi_strategy import RSIStrategy
@@ -16,6 +15,7 @@ from config.strategy_config import (
     MAX_CONCURRENT_POSITIONS
 )
 from src.utils.logger import get_logger
+from .tick import TickView
 
 logger = get_logger(__name__)
 
@@ -34,18 +34,57 @@ class StrategyManager:
     def __init__(self, strategy_name: str = "scalping"):
         self.strategy_name = strategy_name
         self.strategies: Dict[str, BaseStrategy] = {}
-        self.last_tick_times: Dict[str, float] = {}
+        # 종목 ➜ 바인딩된 strategy.on_tick (틱마다 dict 조회 + 메서드 바인딩을 한 번으로 줄임)
+        self._tick_handlers: Dict[str, Callable[[TickView], Dict[str, Any]]] = {}
+        # TickRing symbol_id 로 인덱싱하는 on_tick / 종목명 / 마지막 틱 처리 시각(monotonic_ns)
+        # 처음 보는 id 에서만 _tick_handlers 를 조회해 채우고 이후 틱은 리스트 인덱싱만 한다
+        self._handlers_by_id: List[Optional[Callable[[TickView], Dict[str, Any]]]] = []
+        self._market_by_id: List[Optional[str]] = []
+        self._last_tick_by_id: List[int] = []
+        # symbol_id 가 없는 틱(TickView.from_dict 등)의 마지막 틱 처리 시각
+        self._last_tick_by_name: Dict[str, int] = {}
         
         # 포트폴리오 상태
         self.total_position_value = 0.0
         self.active_positions = 0
         
+        # 포지션 한도 – 매수 후보마다 전역/설정 조회를 하지 않도록 미리 캐시
+        self._max_concurrent = MAX_CONCURRENT_POSITIONS
+        self._max_total_krw = MAX_TOTAL_POSITION_KRW
+        self._max_krw: Dict[str, float] = {}
+        # 현재 신규 매수가 가능한 종목 – 포지션 합계가 바뀔 때(체결/리셋/종목 변경)만 다시 계산
+        self._open_allowed: set[str] = set()
+        
+        # 상태 조회 결과 – 호출마다 중첩 dict 를 새로 만들지 않고 같은 객체를 갱신해 반환
+        self._portfolio_status: Dict[str, Any] = {
+            "active_positions": 0,
+            "total_position_value": 0.0,
+            "total_unrealized_pnl": 0.0,
+            "total_realized_pnl": 0.0,
+            "positions": {},
+            "limits": {
+                "max_concurrent_positions": MAX_CONCURRENT_POSITIONS,
+                "max_total_position_krw": MAX_TOTAL_POSITION_KRW
+            },
+        }
+        # 마지막 조회 이후 체결/리셋으로 포지션이 바뀐 종목 – 포지션 없는 종목은 이때만 다시 채운다
+        self._status_dirty: set[str] = set()
+        self._strategy_performance: Dict[str, Any] = {
+            "strategy_name": strategy_name,
+            "total_trades": 0,
+            "winning_trades": 0,
+            "win_rate": 0.0,
+            "total_pnl": 0.0,
+            "symbol_performance": {},
+        }
+        
         # 성과 추적
         self.portfolio_stats = {
             "total_trades": 0,
             "total_pnl": 0.0,
-            "symbol_stats": defaultdict(dict)
         }
+        # 종목별 성과 – 종목당 객체 하나를 만들어 두고 체결 때마다 제자리 갱신
+        self.symbol_stats: Dict[str, SymbolStats] = {}
         
         self._initialize_strategies()
     
@@ -60,8 +99,49 @@ class StrategyManager:
             config = get_strategy_config(symbol)
             strategy = strategy_class(symbol, config)
             self.strategies[symbol] = strategy
+            self.symbol_stats[symbol] = SymbolStats()
+            self._max_krw[symbol] = get_max_position_krw(symbol)
             
             logger.info("전략 초기화: %s - %s, 설정: %s", symbol, self.strategy_name, config)
+        
+        self._rebind_tick_handlers()
+        self._refresh_open_gate()
+    
+    def _rebind_tick_handlers(self) -> None:
+        """strategies 가 바뀐 뒤 종목별 on_tick 바인딩을 다시 만든다"""
+        self._tick_handlers = {symbol: strategy.on_tick for symbol, strategy in self.strategies.items()}
+        # 남는 종목의 마지막 틱 시각은 이름 기준 테이블로 옮겨 둔다
+        last_tick_times = self.last_tick_times
+        self._last_tick_by_name = {
+            symbol: last_tick_times[symbol] for symbol in self._tick_handlers if symbol in last_tick_times
+        }
+        # id 테이블 세 개는 함께 비우고 다음 틱에서 새 바인딩으로 다시 채운다 (제거된 종목이 남지 않도록)
+        self._handlers_by_id = []
+        self._market_by_id = []
+        self._last_tick_by_id = []
+
+    def _bind_symbol_id(self, symbol_id: int, symbol: str) -> Optional[Callable[[TickView], Dict[str, Any]]]:
+        """symbol_id 의 on_tick 을 찾아 id 테이블에 등록 (종목당 한 번, 모르는 종목이면 None)"""
+        handler = self._tick_handlers.get(symbol)
+        if handler is None:
+            return None
+        missing = symbol_id + 1 - len(self._handlers_by_id)
+        if missing > 0:
+            self._handlers_by_id.extend([None] * missing)
+            self._market_by_id.extend([None] * missing)
+            self._last_tick_by_id.extend([0] * missing)
+        self._handlers_by_id[symbol_id] = handler
+        self._market_by_id[symbol_id] = symbol
+        return handler
+
+    @property
+    def last_tick_times(self) -> Dict[str, int]:
+        """종목별 마지막 틱 처리 시각 (time.monotonic_ns, 경과 시간 비교용)"""
+        times = dict(self._last_tick_by_name)
+        for market, ts in zip(self._market_by_id, self._last_tick_by_id):
+            if market is not None and ts:
+                times[market] = ts
+        return times
     
     def prepare_all_strategies(self, historical_data: Optional[Dict[str, List[Dict]]] = None) -> bool:
         """모든 전략 초기화"""
@@ -79,26 +159,89 @@ class StrategyManager:
         logger.info("전략 준비 결과: %d/%d 성공", success_count, len(self.strategies))
         return success_count == len(self.strategies)
     
-    def process_tick(self, symbol: str, tick: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def process_tick(self, symbol: str, tick: TickView) -> Optional[Dict[str, Any]]:
         """종목별 틱 처리"""
-        if symbol not in self.strategies:
+        if tick.symbol_id >= 0:
+            return self.process_tick_by_id(tick.symbol_id, tick)
+        
+        handler = self._tick_handlers.get(symbol)
+        if handler is None:
             logger.warning("알 수 없는 종목: %s", symbol)
             return None
         
-        strategy = self.strategies[symbol]
-        self.last_tick_times[symbol] = time.time()
-        
-        # 전략 실행
-        signal = strategy.on_tick(tick)
+        self._last_tick_by_name[symbol] = time.monotonic_ns()
+        return self._apply_portfolio_limits(symbol, tick, handler(tick))
+
+    def process_tick_by_id(self, symbol_id: int, tick: TickView) -> Optional[Dict[str, Any]]:
+        """TickRing symbol_id 로 종목별 틱 처리 (종목 문자열 해시 조회 없이 리스트 인덱싱)"""
+        handlers = self._handlers_by_id
+        handler = handlers[symbol_id] if symbol_id < len(handlers) else None
+        if handler is None:
+            handler = self._bind_symbol_id(symbol_id, tick.market)
+            if handler is None:
+                logger.warning("알 수 없는 종목: %s", tick.market)
+                return None
         
-        # 포트폴리오 제한 체크
+        self._last_tick_by_id[symbol_id] = time.monotonic_ns()
+        return self._apply_portfolio_limits(tick.market, tick, handler(tick))
+
+    def _apply_portfolio_limits(self, symbol: str, tick: TickView, signal: Dict[str, Any]) -> Dict[str, Any]:
+        """매수 신호에 포트폴리오 제한 체크 적용"""
         if signal.get("action") == "buy":
-            if not self._can_open_position(symbol, tick.get("trade_price", 0)):
+            if not self._can_open_position(symbol, tick.price):
                 logger.info("포트폴리오 제한으로 매수 거부: %s", symbol)
                 return {"action": "none", "reason": "포트폴리오 제한"}
         
         return signal
-    
+
+    def process_batch(self, ticks: List[TickView]) -> List[Tuple[TickView, Dict[str, Any]]]:
+        """여러 종목 틱을 한 번에 처리하고 action 이 none 이 아닌 (tick, signal) 만 반환
+
+        전략 dict·시각 조회를 배치당 한 번으로 묶는다. 종목별 전략 상태는 순차 의존이므로
+        틱 순서대로 on_tick 을 호출한다 (process_tick 과 같은 결과). on_tick 에서 예외가 난 틱은
+        로그만 남기고 건너뛴다.
+        """
+        handlers = self._handlers_by_id
+        last_tick_by_id = self._last_tick_by_id
+        now = time.monotonic_ns()
+        actionable: List[Tuple[TickView, Dict[str, Any]]] = []
+
+        for tick in ticks:
+            symbol = tick.market
+            symbol_id = tick.symbol_id
+            if symbol_id < 0:
+                handler = self._tick_handlers.get(symbol)
+                if handler is not None:
+                    self._last_tick_by_name[symbol] = now
+            else:
+                handler = handlers[symbol_id] if symbol_id < len(handlers) else None
+                if handler is None:
+                    handler = self._bind_symbol_id(symbol_id, symbol)
+                    # 테이블이 확장됐을 수 있으므로 다시 바인딩
+                    handlers = self._handlers_by_id
+                    last_tick_by_id = self._last_tick_by_id
+                if handler is not None:
+                    last_tick_by_id[symbol_id] = now
+            if handler is None:
+                logger.warning("알 수 없는 종목: %s", symbol)
+                continue
+
+            try:
+                signal = handler(tick)
+            except Exception as exc:
+                # 한 종목 전략의 예외가 같은 배치의 다른 신호까지 버리지 않도록 틱 단위로 격리
+                logger.exception("전략 처리 오류: %s - %s", symbol, exc)
+                continue
+            action = signal.get("action")
+            if action == "none":
+                continue
+            if action == "buy" and not self._can_open_position(symbol, tick.price):
+                logger.info("포트폴리오 제한으로 매수 거부: %s", symbol)
+                continue
+            actionable.append((tick, signal))
+
+        return actionable
+
     def process_order_fill(self, symbol: str, fill: OrderFill) -> None:
         """주문 체결 처리"""
         if symbol not in self.strategies:
@@ -114,81 +257,112 @@ class StrategyManager:
         logger.info("체결 처리 완료: %s %s @ %s", symbol, fill.side, fill.price)
     
     def _can_open_position(self, symbol: str, price: float) -> bool:
-        """포지션 오픈 가능 여부 체크"""
-        # 1. 동시 포지션 수 제한
-        if self.active_positions >= MAX_CONCURRENT_POSITIONS:
-            return False
+        """포지션 오픈 가능 여부 체크 (_refresh_open_gate 가 미리 계산한 결과 조회)"""
+        return symbol in self._open_allowed
+
+    def _refresh_open_gate(self) -> None:
+        """종목별 신규 매수 가능 여부를 다시 계산한다
         
-        # 2. 종목별 최대 금액 제한
-        max_krw = get_max_position_krw(symbol)
-        if max_krw <= 0:
-            return False
+        한도 판정은 동시 포지션 수·전체 포지션 금액·종목별 최대 금액에만 의존하므로
+        틱마다가 아니라 이 값들이 바뀔 때만 호출한다.
+        """
+        allowed = self._open_allowed
+        allowed.clear()
         
-        # 3. 전체 포트폴리오 제한
-        if self.total_position_value + max_krw > MAX_TOTAL_POSITION_KRW:
-            return False
+        # 1. 동시 포지션 수 제한
+        if self.active_positions >= self._max_concurrent:
+            return
         
-        return True
+        headroom = self._max_total_krw - self.total_position_value
+        max_krw_table = self._max_krw
+        for symbol in self.strategies:
+            max_krw = max_krw_table.get(symbol)
+            if max_krw is None:
+                max_krw = max_krw_table[symbol] = get_max_position_krw(symbol)
+            # 2. 종목별 최대 금액 제한 / 3. 전체 포트폴리오 제한
+            if 0 < max_krw <= headroom:
+                allowed.add(symbol)
     
     def _update_portfolio_stats(self, symbol: str, fill: OrderFill) -> None:
         """포트폴리오 통계 업데이트"""
         strategy = self.strategies[symbol]
         
-        if fill.side == "buy":
-            self.active_positions += 1
-            self.total_position_value += fill.price * fill.volume
-        else:
-            self.active_positions = max(0, self.active_positions - 1)
-            self.total_position_value = max(0, self.total_position_value - fill.price * fill.volume)
+        side_sign = fill.side_sign
+        self.active_positions = max(0, self.active_positions + side_sign)
+        self.total_position_value = max(0.0, self.total_position_value + side_sign * fill.price * fill.volume)
+        self._refresh_open_gate()
+        self._status_dirty.add(symbol)
         
         # 전체 통계
         self.portfolio_stats["total_trades"] += 1
         self.portfolio_stats["total_pnl"] += strategy.total_pnl
         
         # 종목별 통계
-        self.portfolio_stats["symbol_stats"][symbol] = strategy.get_performance_stats()
+        stats = self.symbol_stats.get(symbol)
+        if stats is None:
+            stats = self.symbol_stats[symbol] = SymbolStats()
+        strategy.update_performance_stats(stats)
     
+    @staticmethod
+    def _sync_symbol_dicts(table: Dict[str, Dict[str, Any]], strategies: Dict[str, BaseStrategy]) -> None:
+        """종목별 결과 dict 테이블을 현재 strategies 종목 구성에 맞춘다 (종목이 바뀐 경우에만 작업)"""
+        if table.keys() == strategies.keys():
+            return
+        for symbol in [s for s in table if s not in strategies]:
+            del table[symbol]
+        for symbol in strategies:
+            if symbol not in table:
+                table[symbol] = {}
+
     def get_portfolio_status(self) -> Dict[str, Any]:
-        """포트폴리오 전체 상태 반환"""
-        positions = {}
+        """포트폴리오 전체 상태 반환
+        
+        매 호출 같은 dict 를 갱신해 반환하므로, 보관하려면 호출 측에서 복사해야 한다.
+        """
+        status = self._portfolio_status
+        positions = status["positions"]
+        self._sync_symbol_dicts(positions, self.strategies)
+        dirty = self._status_dirty
         total_unrealized_pnl = 0.0
         
+        # 포지션 없는 종목의 정보는 체결/리셋 때만 바뀐다 – 열린 포지션(미실현 손익이 틱마다 변함)과
+        # 새로 추가됐거나 dirty 인 종목만 다시 채운다
         for symbol, strategy in self.strategies.items():
-            pos_info = strategy.get_position_info()
-            positions[symbol] = pos_info
+            pos_info = positions[symbol]
+            if not pos_info or symbol in dirty or strategy.position.position_type is not POS_NONE:
+                strategy.get_position_info(pos_info)
             total_unrealized_pnl += pos_info["unrealized_pnl"]
+        dirty.clear()
         
-        return {
-            "active_positions": self.active_positions,
-            "total_position_value": round(self.total_position_value, 2),
-            "total_unrealized_pnl": round(total_unrealized_pnl, 2),
-            "total_realized_pnl": round(self.portfolio_stats["total_pnl"], 2),
-            "positions": positions,
-            "limits": {
-                "max_concurrent_positions": MAX_CONCURRENT_POSITIONS,
-                "max_total_position_krw": MAX_TOTAL_POSITION_KRW
-            }
-        }
+        status["active_positions"] = self.active_positions
+        status["total_position_value"] = round(self.total_position_value, 2)
+        status["total_unrealized_pnl"] = round(total_unrealized_pnl, 2)
+        status["total_realized_pnl"] = round(self.portfolio_stats["total_pnl"], 2)
+        return status
     
     def get_strategy_performance(self) -> Dict[str, Any]:
-        """전략 성과 반환"""
-        total_trades = sum(s.total_trades for s in self.strategies.values())
-        total_winning = sum(s.winning_trades for s in self.strategies.values())
-        total_pnl = sum(s.total_pnl for s in self.strategies.values())
+        """전략 성과 반환 (get_portfolio_status 와 같이 매 호출 같은 dict 를 갱신해 반환)"""
+        performance = self._strategy_performance
+        symbol_performance = performance["symbol_performance"]
+        self._sync_symbol_dicts(symbol_performance, self.strategies)
+        total_trades = 0
+        total_winning = 0
+        total_pnl = 0.0
+        
+        # 전략 목록을 한 번만 순회하며 합계와 종목별 통계를 함께 만든다
+        for symbol, strategy in self.strategies.items():
+            total_trades += strategy.total_trades
+            total_winning += strategy.winning_trades
+            total_pnl += strategy.total_pnl
+            strategy.get_performance_stats(symbol_performance[symbol])
         
         win_rate = (total_winning / total_trades * 100) if total_trades > 0 else 0.0
         
-        return {
-            "strategy_name": self.strategy_name,
-            "total_trades": total_trades,
-            "winning_trades": total_winning,
-            "win_rate": round(win_rate, 2),
-            "total_pnl": round(total_pnl, 2),
-            "symbol_performance": {
-                symbol: strategy.get_performance_stats() 
-                for symbol, strategy in self.strategies.items()
-            }
-        }
+        performance["total_trades"] = total_trades
+        performance["winning_trades"] = total_winning
+        performance["win_rate"] = round(win_rate, 2)
+        performance["total_pnl"] = round(total_pnl, 2)
+        return performance
     
     def reset_all_strategies(self) -> None:
         """모든 전략 상태 초기화"""
@@ -200,8 +374,10 @@ class StrategyManager:
         self.portfolio_stats = {
             "total_trades": 0,
             "total_pnl": 0.0,
-            "symbol_stats": defaultdict(dict)
         }
+        self.symbol_stats = {symbol: SymbolStats() for symbol in self.strategies}
+        self._refresh_open_gate()
+        self._status_dirty.update(self.strategies)
         
         logger.info("모든 전략 상태 초기화 완료")
     
@@ -211,7 +387,7 @@ class StrategyManager:
             "strategy_name": self.strategy_name,
             "symbols": list(self.strategies.keys()),
             "strategy_configs": {
-                symbol: get_strategy_config(symbol) 
+                symbol: dict(get_strategy_config(symbol))
                 for symbol in self.strategies.keys()
             }
         }
@@ -238,6 +414,7 @@ class StrategyManager:
                 config = get_strategy_config(sym)
                 self.strategies[sym] = strategy_class(sym, config)
                 self.strategies[sym].prepare()
+                self.symbol_stats.setdefault(sym, SymbolStats())
                 logger.info("전략 추가: %s", sym)
             except Exception as exc:  # pragma: no cover – continues others
                 logger.warning("전략 추가 실패 %s: %s", sym, exc)
@@ -255,10 +432,13 @@ class StrategyManager:
                 continue
             logger.info("전략 제거: %s", sym)
 
+        self._rebind_tick_handlers()
+
         # 포트폴리오 상태 리셋(합산 값 재계산)
         self.total_position_value = sum(
             s.position.entry_price * s.position.volume for s in self.strategies.values() if s.position
         )
         self.active_positions = sum(
             1 for s in self.strategies.values() if s.position and s.position.position_type != PositionType.NONE
-        ) 
\ No newline at end of file
+        )
+        self._refresh_open_gate() 
\ No newline at end of file
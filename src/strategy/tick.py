@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+"""틱 표현 – 전략·매매 경로가 공유하는 TickView 와 틱 종류 상수.
+
+전략 코드는 이 모듈만 참조하고, 틱을 어디서 받는지(TickRing 등 전송 계층)는 알 필요가 없다.
+"""
+
+from typing import Any, Dict
+
+KIND_TICKER = 0
+KIND_ORDERBOOK = 1
+
+
+class TickView:
+    """틱 레코드 하나의 속성 접근 뷰 – 소비자가 dict 키 해시·기본값 처리 없이 LOAD_ATTR 로 읽는다"""
+
+    __slots__ = ("market", "kind", "price", "volume", "ts", "best_bid", "best_ask", "symbol_id")
+
+    def __init__(
+        self,
+        market: str,
+        kind: int,
+        price: float,
+        volume: float = 0.0,
+        ts: int = 0,
+        best_bid: float = 0.0,
+        best_ask: float = 0.0,
+        symbol_id: int = -1,
+    ):
+        self.market = market
+        self.kind = kind
+        self.price = price
+        self.volume = volume
+        self.ts = ts
+        self.best_bid = best_bid
+        self.best_ask = best_ask
+        # TickRing symbol_id – 소비자가 종목별 상태를 리스트 인덱스로 찾는 데 사용 (링 밖에서 만든 뷰는 -1)
+        self.symbol_id = symbol_id
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TickView":
+        """기존 틱 dict(type/code/trade_price/...) ➜ TickView (외부 호출·호환용)"""
+        return cls(
+            data.get("code") or data.get("market"),
+            KIND_ORDERBOOK if data.get("type") == "orderbook" else KIND_TICKER,
+            float(data.get("trade_price") or 0.0),
+            float(data.get("trade_volume") or 0.0),
+            int(data.get("timestamp") or 0),
+            float(data.get("best_bid") or 0.0),
+            float(data.get("best_ask") or 0.0),
+        )
@@ -4,7 +4,7 @@ from dataclasses import dataclass
 import time
 
 
-@dataclass
+@dataclass(slots=True)
 class PartialPosition:
     """부분 포지션 정보"""
     volume: float
@@ -28,16 +28,19 @@ class TrailingStopMixin:
         
         # 부분 청산 설정
         self.partial_close_enabled = kwargs.get("partial_close_enabled", False)
-        self.partial_close_levels = kwargs.get("partial_close_levels", [0.5, 1.0, 1.5])  # 수익률 %
-        self.partial_close_ratios = kwargs.get("partial_close_ratios", [0.3, 0.3, 0.4])  # 청산 비율
+        self.partial_close_levels = tuple(kwargs.get("partial_close_levels", (0.5, 1.0, 1.5)))  # 수익률 %
+        self.partial_close_ratios = tuple(kwargs.get("partial_close_ratios", (0.3, 0.3, 0.4)))  # 청산 비율
         
         # 트레일링 스탑 상태
         self.highest_price = 0.0
         self.trailing_stop_price = 0.0
         self.trailing_active = False
+        # 최고가 ➜ 스탑 가격 배율 (1 - trailing_stop_pct/100) – 포지션 오픈 시 계산해 틱마다 나눗셈 생략
+        self._trail_factor = 1.0 - self.trailing_stop_pct / 100.0
         
         # 부분 청산 상태
         self.partial_positions: List[PartialPosition] = []
+        self._closed_count = 0  # partial_positions 중 청산된 개수 (조회 시 리스트 순회 생략)
         self.next_partial_level_idx = 0
         self.remaining_volume = 0.0
 
@@ -46,6 +49,7 @@ class TrailingStopMixin:
         self.highest_price = entry_price
         self.trailing_stop_price = 0.0
         self.trailing_active = False
+        self._trail_factor = 1.0 - self.trailing_stop_pct / 100.0
         
         # 부분 청산을 위한 포지션 분할
         if self.partial_close_enabled:
@@ -56,6 +60,7 @@ class TrailingStopMixin:
     def _setup_partial_positions(self, entry_price: float, total_volume: float) -> None:
         """부분 포지션 설정"""
         self.partial_positions.clear()
+        self._closed_count = 0
         self.next_partial_level_idx = 0
         
         # 비율에 따라 포지션 분할
@@ -73,58 +78,67 @@ class TrailingStopMixin:
 
     def update_trailing_stop(self, current_price: float) -> Optional[Dict[str, Any]]:
         """트레일링 스탑 업데이트"""
-        if not self.trailing_stop_enabled or self.position.entry_price <= 0:
+        # 진입가 역수는 BaseStrategy 가 체결 시 갱신 (포지션 없으면 0.0)
+        inv_entry_price = self._inv_entry_price
+        if not self.trailing_stop_enabled or inv_entry_price <= 0:
             return None
         
         # 최고가 업데이트
-        if current_price > self.highest_price:
-            self.highest_price = current_price
+        highest_price = self.highest_price
+        if current_price > highest_price:
+            highest_price = self.highest_price = current_price
         
         # 트레일링 활성화 체크
-        entry_gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
+        entry_gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
+        trail_factor = self._trail_factor
         
-        if not self.trailing_active and entry_gain_pct >= self.trailing_activation_pct:
-            self.trailing_active = True
-            self.trailing_stop_price = self.highest_price * (1 - self.trailing_stop_pct / 100)
+        trailing_active = self.trailing_active
+        if not trailing_active and entry_gain_pct >= self.trailing_activation_pct:
+            trailing_active = self.trailing_active = True
+            self.trailing_stop_price = highest_price * trail_factor
         
         # 트레일링 스탑 가격 업데이트
-        if self.trailing_active:
-            new_stop_price = self.highest_price * (1 - self.trailing_stop_pct / 100)
-            if new_stop_price > self.trailing_stop_price:
-                self.trailing_stop_price = new_stop_price
+        if trailing_active:
+            stop_price = self.trailing_stop_price
+            new_stop_price = highest_price * trail_factor
+            if new_stop_price > stop_price:
+                stop_price = self.trailing_stop_price = new_stop_price
             
             # 트레일링 스탑 트리거 체크
-            if current_price <= self.trailing_stop_price:
+            if current_price <= stop_price:
                 return {
                     "action": "sell",
                     "price": current_price,
                     "volume": self.remaining_volume,
-                    "reason": f"트레일링 스탑 실행 (최고가: {self.highest_price:.2f}, 스탑: {self.trailing_stop_price:.2f})"
+                    "reason": f"트레일링 스탑 실행 (최고가: {highest_price:.2f}, 스탑: {stop_price:.2f})"
                 }
         
         return None
 
     def check_partial_close(self, current_price: float) -> Optional[Dict[str, Any]]:
         """부분 청산 체크"""
-        if not self.partial_close_enabled or self.position.entry_price <= 0:
+        inv_entry_price = self._inv_entry_price
+        if not self.partial_close_enabled or inv_entry_price <= 0:
             return None
         
-        if self.next_partial_level_idx >= len(self.partial_close_levels):
+        level_idx = self.next_partial_level_idx
+        if level_idx >= len(self.partial_close_levels):
             return None
         
         # 현재 수익률 계산
-        gain_pct = (current_price - self.position.entry_price) / self.position.entry_price * 100
-        target_level = self.partial_close_levels[self.next_partial_level_idx]
+        gain_pct = (current_price * inv_entry_price - 1.0) * 100.0
+        target_level = self.partial_close_levels[level_idx]
         
         if gain_pct >= target_level:
             # 해당 레벨의 포지션 청산
-            position_to_close = self.partial_positions[self.next_partial_level_idx]
+            position_to_close = self.partial_positions[level_idx]
             
             if not position_to_close.is_closed:
                 position_to_close.is_closed = True
                 position_to_close.close_price = current_price
                 position_to_close.close_time = time.time()
                 
+                self._closed_count += 1
                 self.remaining_volume -= position_to_close.volume
                 self.next_partial_level_idx += 1
                 
@@ -150,14 +164,13 @@ class TrailingStopMixin:
 
     def get_partial_close_info(self) -> Dict[str, Any]:
         """부분 청산 정보 반환"""
-        closed_positions = [p for p in self.partial_positions if p.is_closed]
-        open_positions = [p for p in self.partial_positions if not p.is_closed]
+        total_positions = len(self.partial_positions)
         
         return {
             "partial_close_enabled": self.partial_close_enabled,
-            "total_positions": len(self.partial_positions),
-            "closed_positions": len(closed_positions),
-            "open_positions": len(open_positions),
+            "total_positions": total_positions,
+            "closed_positions": self._closed_count,
+            "open_positions": total_positions - self._closed_count,
             "remaining_volume": self.remaining_volume,
             "next_level_idx": self.next_partial_level_idx,
             "next_target_level": (
@@ -172,6 +185,8 @@ class TrailingStopMixin:
         self.highest_price = 0.0
         self.trailing_stop_price = 0.0
         self.trailing_active = False
+        self._trail_factor = 1.0 - self.trailing_stop_pct / 100.0
         self.partial_positions.clear()
+        self._closed_count = 0
         self.next_partial_level_idx = 0
         self.remaining_volume = 0.0 
\ No newline at end of file
@@ -1,3 +1,12 @@
+from __future__ import annotations
+import time
+
+from config.risk_config import DAILY_LOSS_LIMIT_KRW, MAX_COIN_RATIO
+from config.strategy_config import MAX_CONCURRENT_POSITIONS
+
+_SECONDS_PER_DAY = 86400
+
+
 class RiskManager:
     """리스크 관리 로직
 
@@ -10,8 +19,8 @@ class RiskManager:
 
     def __init__(self, max_position_krw: float):
         self.max_position_krw = max_position_krw
-        # 마지막으로 리셋한 날짜(YYYY-MM-DD)
-        self._last_reset_date: str | None = None
+        # 마지막으로 리셋한 날짜 (UTC epoch 기준 일 번호)
+        self._last_reset_day: int | None = None
 
     def allow_order(
         self,
@@ -29,17 +38,12 @@ class RiskManager:
             active_positions: 열려있는 포지션 수
         """
 
-        # 날짜가 바뀌면(자정 지나면) 리셋 – RiskManager 내부 상태 유지 시 대비
-        from datetime import datetime
-
-        today = datetime.utcnow().strftime("%Y-%m-%d")
-        if self._last_reset_date != today:
+        # 날짜가 바뀌면(UTC 자정 지나면) 리셋 – RiskManager 내부 상태 유지 시 대비
+        # 문자열 포맷 대신 epoch 초를 하루 길이로 나눈 일 번호로 비교
+        today = int(time.time() // _SECONDS_PER_DAY)
+        if self._last_reset_day != today:
             # 현재 버전에서는 RiskManager가 자체 카운터는 없지만, 향후 확장 대비
-            self._last_reset_date = today
-
-        # 설정값 로드 (순환 import 방지 – 함수 내부에서 import)
-        from config.risk_config import DAILY_LOSS_LIMIT_KRW, MAX_COIN_RATIO
-        from config.strategy_config import MAX_CONCURRENT_POSITIONS
+            self._last_reset_day = today
 
         # 1) 일일 손실 한도
         if realized_daily_pnl <= -DAILY_LOSS_LIMIT_KRW:
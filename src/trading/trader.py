@@ -2,8 +2,7 @@ from __future__ import annotations
 from queue import Queue, Empty
 from threading import Event
 import time
-from datetime import datetime
-import uuid
+from itertools import count
 from typing import Dict, Any, Optional
 
 from src.strategy.strategy_manager import StrategyManager
@@ -12,14 +11,21 @@ from src.trading.risk_manager import RiskManager
 from config.strategy_config import SYMBOLS, get_max_position_krw
 from src.utils.logger import get_logger
 from src.utils.symbol_manager import SymbolManager
+from src.utils.tick_ring import TickRing
 
 logger = get_logger(__name__)
 
+# API 요청 ID – 프로세스 안에서 응답을 짝짓기만 하면 되므로 uuid4 대신 증가 정수 사용 (1 부터, 항상 truthy)
+_next_request_id = count(1).__next__
+
 
 class Trader:
     """실시간 데이터로 다중 종목 전략 실행 및 주문"""
 
     ORDER_INTERVAL = 0.15  # 초 (Upbit 1초당 8회 제한)
+    ORDER_INTERVAL_NS = int(ORDER_INTERVAL * 1e9)  # monotonic_ns 정수 비교용
+    RESP_DRAIN_MAX = 64  # 루프 1회당 처리할 최대 API 응답 수
+    TICK_BATCH = 64  # 루프 1회당 꺼낼 최대 틱 수
 
     # ---------------- Pending-order 관리 상수 ----------------
     PENDING_CHECK_INTERVAL = 0.3  # 주문 상태 조회 주기(초)
@@ -33,7 +39,7 @@ class Trader:
         coin_balances: Dict[str, float],
         last_prices: Dict[str, float],
         order_q: Queue,
-        pending_requests: Dict[str, Any],
+        pending_requests: Dict[int, Any],
         notify_q: Queue,
     ) -> None:
         """심볼 변경 시 포지션·리스크 매니저·잔고 구조를 재바인딩한다.
@@ -53,7 +59,7 @@ class Trader:
         for sym in removed_syms:
             vol = coin_balances.get(sym, 0.0)
             if vol and vol > 0:
-                sell_req_id = str(uuid.uuid4())
+                sell_req_id = _next_request_id()
                 order_q.put({
                     "type": "order",
                     "params": {
@@ -85,7 +91,7 @@ class Trader:
             last_prices[sym] = last_prices.get(sym, 0.0)
 
             # 잔고 조회 (새 심볼 첫 추가)
-            bal_req_id = str(uuid.uuid4())
+            bal_req_id = _next_request_id()
             order_q.put({
                 "type": "query",
                 "method": "get_balance",
@@ -101,7 +107,7 @@ class Trader:
 
     @staticmethod
     def run(
-        market_q: Queue,
+        market_q: TickRing,
         command_q: Queue,
         notify_q: Queue,
         db_q: Queue,
@@ -126,7 +132,7 @@ class Trader:
             for symbol in symbol_manager.symbols
         }
 
-        last_order_ts = 0.0
+        last_order_ts_ns = 0  # 마지막 주문 시각 (time.monotonic_ns – NTP 보정 영향 없음)
         trading_paused = False  # /pause 명령 처리용
         pending_requests = {}  # {request_id: request_info}
         pending_orders = {}    # {uuid: order_info}
@@ -138,7 +144,7 @@ class Trader:
         last_prices = {symbol: 0.0 for symbol in symbol_manager.symbols}
         
         # 초기 잔고 조회
-        balance_req_id = str(uuid.uuid4())
+        balance_req_id = _next_request_id()
         order_q.put({
             "type": "query",
             "method": "get_balance",
@@ -149,7 +155,7 @@ class Trader:
         
         # 각 종목별 코인 잔고 조회
         for symbol in symbol_manager.symbols:
-            coin_req_id = str(uuid.uuid4())
+            coin_req_id = _next_request_id()
             order_q.put({
                 "type": "query",
                 "method": "get_balance",
@@ -187,10 +193,14 @@ class Trader:
             except Empty:
                 pass
 
-            # API 응답 처리
-            while not resp_q.empty():
+            # API 응답 처리 – empty() 확인 없이 Empty 가 날 때까지 꺼내되, 시장 데이터 처리가
+            # 밀리지 않도록 한 루프에 최대 RESP_DRAIN_MAX 개까지만 처리
+            for _ in range(Trader.RESP_DRAIN_MAX):
                 try:
                     response = resp_q.get_nowait()
+                except Empty:
+                    break
+                try:
                     req_id = response.get("request_id")
                     if req_id in pending_requests:
                         req_info = pending_requests.pop(req_id)
@@ -277,7 +287,7 @@ class Trader:
                                 strategy_manager.process_order_fill(po["symbol"], fill)
 
                                 notify_q.put(f"[FILL] {po['side'].upper()} {po['symbol']} @ {avg_price:.0f} (ID: {uuid_val[:8]})")
-                                db_q.put((datetime.utcnow().isoformat(), po["side"].upper(), po["symbol"], avg_price, exec_vol))
+                                db_q.put((time.time_ns(), po["side"].upper(), po["symbol"], avg_price, exec_vol))
 
                                 # 잔고 재조회
                                 _refresh_balances(order_q, pending_requests, po["symbol"])
@@ -308,7 +318,7 @@ class Trader:
             for uid, po in list(pending_orders.items()):
                 # 상태 조회 주기
                 if now_ts - po["last_check"] >= Trader.PENDING_CHECK_INTERVAL:
-                    status_req_id = str(uuid.uuid4())
+                    status_req_id = _next_request_id()
                     order_q.put({
                         "type": "query",
                         "method": "get_order",
@@ -320,7 +330,7 @@ class Trader:
 
                 # 타임아웃 처리(선택)
                 if now_ts - po["sent_ts"] >= Trader.PENDING_TIMEOUT_SEC:
-                    cancel_req_id = str(uuid.uuid4())
+                    cancel_req_id = _next_request_id()
                     order_q.put({
                         "type": "query",
                         "method": "cancel_order",
@@ -329,123 +339,123 @@ class Trader:
                     })
                     pending_requests[cancel_req_id] = {"type": "cancel_order", "uuid": uid}
 
-            # 시장 데이터 처리
+            # 시장 데이터 처리 – 쌓인 틱을 한 번에 최대 TICK_BATCH 개까지 꺼내 배치로 처리
             try:
-                tick = market_q.get(timeout=1)
-                symbol = tick.get("code") or tick.get("market")
-                
-                if not symbol or symbol not in symbol_manager.symbols:
-                    continue
-                    
+                # dict 대신 TickView 로 받아 이후 경로는 속성 접근만 한다
+                ticks = market_q.get_views(Trader.TICK_BATCH, timeout=1)
             except Empty:
                 continue
 
             try:
-                current_price = tick.get("trade_price")
+                active_symbols = symbol_manager.symbols
+                ticks = [tick for tick in ticks if tick.market in active_symbols]
                 # 최근 가격 저장 (자산 비중 계산용)
-                if current_price is not None:
-                    last_prices[symbol] = current_price
-                
-                # 전략 실행 (ticker & orderbook 모두 전달)
-                signal = strategy_manager.process_tick(symbol, tick)
-                if not signal or signal.get("action") == "none":
-                    continue
+                for tick in ticks:
+                    last_prices[tick.market] = tick.price
                 
-                action = signal["action"]
-                reason = signal.get("reason", "")
+                # 전략 실행 (ticker & orderbook 모두 전달) – action 이 있는 (tick, signal) 만 돌려받는다
+                signals = strategy_manager.process_batch(ticks)
+            except Exception as exc:
+                logger.exception("Trading error: %s", exc)
+                notify_q.put(f"[ERROR] {exc}")
+                signals = []
+
+            for tick, signal in signals:
+                try:
+                    symbol = tick.market
+                    current_price = tick.price
+                    action = signal["action"]
+                    reason = signal.get("reason", "")
                 
-                # Rate limiting 체크
-                if time.time() - last_order_ts < Trader.ORDER_INTERVAL:
-                    continue
+                    # Rate limiting 체크
+                    if time.monotonic_ns() - last_order_ts_ns < Trader.ORDER_INTERVAL_NS:
+                        continue
                 
-                # 매수 처리
-                if action == "buy":
-                    if current_price is None:
-                        continue  # 가격 정보 없으면 주문 불가
-                    risk_mgr = risk_managers[symbol]
-
-                    # -------------------- Risk / Money Management --------------------
-                    # 1) 자산 비중 계산
-                    total_coin_value = sum(
-                        coin_balances[sym] * last_prices.get(sym, 0.0)
-                        for sym in symbol_manager.symbols
-                    )
-                    total_assets = total_coin_value + krw_balance
-                    coin_ratio = (total_coin_value / total_assets) if total_assets > 0 else 0.0
-
-                    # 2) 당일 실현 손익 합계 (모든 전략 합산)
-                    realized_daily_pnl = sum(
-                        s.total_pnl for s in strategy_manager.strategies.values()
-                    )
-
-                    if risk_mgr.allow_order(
-                        krw_balance=krw_balance,
-                        coin_ratio=coin_ratio,
-                        realized_daily_pnl=realized_daily_pnl,
-                        active_positions=strategy_manager.active_positions,
-                    ):
-                        max_krw = get_max_position_krw(symbol)
-                        vol_krw = min(krw_balance, max_krw)
+                    # 매수 처리
+                    if action == "buy":
+                        if current_price is None:
+                            continue  # 가격 정보 없으면 주문 불가
+                        risk_mgr = risk_managers[symbol]
+
+                        # -------------------- Risk / Money Management --------------------
+                        # 1) 자산 비중 계산
+                        total_coin_value = sum(
+                            coin_balances[sym] * last_prices.get(sym, 0.0)
+                            for sym in symbol_manager.symbols
+                        )
+                        total_assets = total_coin_value + krw_balance
+                        coin_ratio = (total_coin_value / total_assets) if total_assets > 0 else 0.0
+
+                        # 2) 당일 실현 손익 합계 (모든 전략 합산)
+                        realized_daily_pnl = sum(
+                            s.total_pnl for s in strategy_manager.strategies.values()
+                        )
+
+                        if risk_mgr.allow_order(
+                            krw_balance=krw_balance,
+                            coin_ratio=coin_ratio,
+                            realized_daily_pnl=realized_daily_pnl,
+                            active_positions=strategy_manager.active_positions,
+                        ):
+                            max_krw = get_max_position_krw(symbol)
+                            vol_krw = min(krw_balance, max_krw)
                         
-                        if vol_krw < 5000:  # 업비트 최소 주문 금액
-                            continue
+                            if vol_krw < 5000:  # 업비트 최소 주문 금액
+                                continue
                             
-                        buy_req_id = str(uuid.uuid4())
-                        order_q.put({
-                            "type": "order",
-                            "params": {
-                                "market": symbol,
-                                "side": "buy",
-                                "ord_type": "market",
-                                "volume": vol_krw
-                            },
-                            "request_id": buy_req_id
-                        })
-                        pending_requests[buy_req_id] = {
-                            "type": "buy_order",
-                            "symbol": symbol,
-                            "price": current_price,
-                            "volume": vol_krw / current_price,  # 코인 수량 계산
-                            "reason": reason
-                        }
-                        last_order_ts = time.time()
-                        logger.info("매수 주문: %s @ %s (%s)", symbol, current_price, reason)
-
-                # 매도 처리
-                elif action == "sell":
-                    if current_price is None:
-                        continue  # 가격 정보 없으면 주문 불가
-                    coin_balance = coin_balances.get(symbol, 0.0)
-                    sell_volume = signal.get("volume", coin_balance)  # 부분 청산 지원
+                            buy_req_id = _next_request_id()
+                            order_q.put({
+                                "type": "order",
+                                "params": {
+                                    "market": symbol,
+                                    "side": "buy",
+                                    "ord_type": "market",
+                                    "volume": vol_krw
+                                },
+                                "request_id": buy_req_id
+                            })
+                            pending_requests[buy_req_id] = {
+                                "type": "buy_order",
+                                "symbol": symbol,
+                                "price": current_price,
+                                "volume": vol_krw / current_price,  # 코인 수량 계산
+                                "reason": reason
+                            }
+                            last_order_ts_ns = time.monotonic_ns()
+                            logger.info("매수 주문: %s @ %s (%s)", symbol, current_price, reason)
+
+                    # 매도 처리
+                    elif action == "sell":
+                        if current_price is None:
+                            continue  # 가격 정보 없으면 주문 불가
+                        coin_balance = coin_balances.get(symbol, 0.0)
+                        sell_volume = signal.get("volume", coin_balance)  # 부분 청산 지원
                     
-                    if sell_volume > 0:
-                        sell_req_id = str(uuid.uuid4())
-                        order_q.put({
-                            "type": "order",
-                            "params": {
-                                "market": symbol,
-                                "side": "sell",
-                                "ord_type": "market",
-                                "volume": sell_volume
-                            },
-                            "request_id": sell_req_id
-                        })
-                        pending_requests[sell_req_id] = {
-                            "type": "sell_order",
-                            "symbol": symbol,
-                            "price": current_price,
-                            "volume": sell_volume,
-                            "reason": reason
-                        }
-                        last_order_ts = time.time()
-                        logger.info("매도 주문: %s @ %s, 수량: %s (%s)", symbol, current_price, sell_volume, reason)
-
-            except Exception as exc:
-                logger.exception("Trading error: %s", exc)
-                notify_q.put(f"[ERROR] {exc}")
+                        if sell_volume > 0:
+                            sell_req_id = _next_request_id()
+                            order_q.put({
+                                "type": "order",
+                                "params": {
+                                    "market": symbol,
+                                    "side": "sell",
+                                    "ord_type": "market",
+                                    "volume": sell_volume
+                                },
+                                "request_id": sell_req_id
+                            })
+                            pending_requests[sell_req_id] = {
+                                "type": "sell_order",
+                                "symbol": symbol,
+                                "price": current_price,
+                                "volume": sell_volume,
+                                "reason": reason
+                            }
+                            last_order_ts_ns = time.monotonic_ns()
+                            logger.info("매도 주문: %s @ %s, 수량: %s (%s)", symbol, current_price, sell_volume, reason)
 
-            # CPU cool-down
-            time.sleep(0.01)
+                except Exception as exc:
+                    logger.exception("Trading error: %s", exc)
+                    notify_q.put(f"[ERROR] {exc}")
 
             # ---------------- 심볼 동적 갱신 ----------------
             if symbol_manager.maybe_refresh():
@@ -463,10 +473,10 @@ class Trader:
         logger.info("Trader 종료")
 
 
-def _refresh_balances(order_q: Queue, pending_requests: Dict, symbol: str) -> None:
+def _refresh_balances(order_q: Queue, pending_requests: Dict[int, Any], symbol: str) -> None:
     """잔고 재조회 요청"""
     # KRW 잔고
-    krw_req_id = str(uuid.uuid4())
+    krw_req_id = _next_request_id()
     order_q.put({
         "type": "query",
         "method": "get_balance",
@@ -476,7 +486,7 @@ def _refresh_balances(order_q: Queue, pending_requests: Dict, symbol: str) -> No
     pending_requests[krw_req_id] = {"type": "balance_krw"}
     
     # 코인 잔고
-    coin_req_id = str(uuid.uuid4())
+    coin_req_id = _next_request_id()
     order_q.put({
         "type": "query",
         "method": "get_balance",
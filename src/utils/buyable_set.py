@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""BuyableSet – SharedMemory 플래그 배열로 공유하는 '매수 가능 종목' 집합.
+
+IndicatorWorker 가 종목별 플래그 바이트(uint8)를 켜고/끄며, SymbolManager 등 읽는 쪽은 Manager RPC 없이
+바이트 하나를 읽는다. 종목마다 바이트가 따로 있어 여러 IndicatorWorker 가 서로 다른 종목을
+동시에 기록해도 read-modify-write 경합이 없다. 인덱스는 TickRing 의 symbol_id 를 그대로 사용하므로
+두 객체는 같은 symbol_table(symbol_id ➜ market)을 공유해야 한다.
+"""
+
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+# TickRing symbol_id(u16) 전체를 덮는 크기 (종목당 1바이트)
+_N_BYTES = 65536
+
+
+class BuyableSet:
+    """매수 가능 종목 플래그 배열 (dict 의 keys()/len()/in 과 호환)
+
+    Args:
+        symbol_table: TickRing 과 공유하는 symbol_id ➜ market Manager dict
+    """
+
+    def __init__(self, symbol_table: Dict[int, str]):
+        self._shm = shared_memory.SharedMemory(create=True, size=_N_BYTES)
+        self._shm.buf[:_N_BYTES] = bytes(_N_BYTES)
+        self._symbol_table = symbol_table
+        self._init_local_state()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"shm_name": self._shm.name, "symbol_table": self._symbol_table}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._shm = shared_memory.SharedMemory(name=state["shm_name"])
+        self._symbol_table = state["symbol_table"]
+        self._init_local_state()
+
+    def _init_local_state(self) -> None:
+        self._buf = self._shm.buf
+        # symbol_table 로컬 캐시 (양방향)
+        self._ids: Dict[str, int] = {}
+        self._symbols: Dict[int, str] = {}
+
+    def _refresh_table(self) -> None:
+        self._symbols = dict(self._symbol_table)
+        self._ids = {m: i for i, m in self._symbols.items()}
+
+    def _id_of(self, market: str) -> Optional[int]:
+        symbol_id = self._ids.get(market)
+        if symbol_id is None:
+            self._refresh_table()
+            symbol_id = self._ids.get(market)
+        return symbol_id
+
+    # ----------------------- Writer ----------------------- #
+    def add(self, market: str) -> None:
+        symbol_id = self._id_of(market)
+        if symbol_id is not None:
+            self._buf[symbol_id] = 1
+
+    def discard(self, market: str) -> None:
+        symbol_id = self._id_of(market)
+        if symbol_id is not None:
+            self._buf[symbol_id] = 0
+
+    def set_id(self, symbol_id: int, flag: bool) -> None:
+        """symbol_id 로 직접 플래그 기록 (TickRing symbol_id 를 이미 알고 있는 IndicatorWorker 용)"""
+        self._buf[symbol_id] = 1 if flag else 0
+
+    # ----------------------- Reader ----------------------- #
+    def __contains__(self, market: object) -> bool:
+        symbol_id = self._id_of(market) if isinstance(market, str) else None
+        return symbol_id is not None and self._buf[symbol_id] != 0
+
+    def _live_flags(self) -> bytes:
+        """현재 할당된 symbol_id 범위의 플래그만 복사
+
+        TickRing 은 symbol_id 를 0 부터 빈틈없이 부여하므로 symbol_table 크기만큼만 보면 된다.
+        """
+        n_ids = len(self._symbol_table)
+        if n_ids != len(self._symbols):
+            self._refresh_table()
+        return bytes(self._buf[:n_ids])
+
+    def keys(self) -> List[str]:
+        """플래그가 켜진 종목 리스트"""
+        data = self._live_flags()
+        symbols = self._symbols
+        result = []
+        idx = data.find(1)
+        while idx != -1:
+            if idx in symbols:
+                result.append(symbols[idx])
+            idx = data.find(1, idx + 1)
+        return result
+
+    def __len__(self) -> int:
+        return self._live_flags().count(1)
+
+    # ----------------------- Cleanup ----------------------- #
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
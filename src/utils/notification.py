@@ -2,6 +2,7 @@ from __future__ import annotations
 import asyncio
 from queue import Empty, Queue
 from threading import Event
+from typing import Optional
 
 from telegram.ext import (
     ApplicationBuilder,
@@ -10,7 +11,6 @@ from telegram.ext import (
     AIORateLimiter,
 )
 
-from config.api_config import TELEGRAM_CHAT_ID, TELEGRAM_TOKEN
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -22,7 +22,13 @@ class TelegramBot:
     POLL_INTERVAL = 0.5  # 초 – 노티 큐 폴링 간격
 
     @staticmethod
-    def run(command_q: Queue, notify_q: Queue, stop_event: Event) -> None:  # pragma: no cover – 별도 프로세스
+    def run(
+        command_q: Queue,
+        notify_q: Queue,
+        stop_event: Event,
+        token: Optional[str] = None,
+        chat_id: Optional[int] = None,
+    ) -> None:  # pragma: no cover – 별도 프로세스
         """별도 프로세스에서 호출
 
         Parameters
@@ -33,9 +39,17 @@ class TelegramBot:
             시스템 전역 알림 문자열 큐
         stop_event : Event
             전체 시스템 shutdown 이벤트
+        token, chat_id : optional
+            부모 프로세스에서 해석한 텔레그램 설정 (없으면 config.api_config 사용)
         """
 
-        if TELEGRAM_TOKEN is None or TELEGRAM_CHAT_ID is None:
+        if token is None or chat_id is None:
+            from config.api_config import TELEGRAM_CHAT_ID, TELEGRAM_TOKEN
+
+            token = token or TELEGRAM_TOKEN
+            chat_id = chat_id or TELEGRAM_CHAT_ID
+
+        if token is None or chat_id is None:
             logger.warning("Telegram 비활성화: 토큰 또는 챗 ID 미설정")
             stop_event.wait()
             return
@@ -46,7 +60,7 @@ class TelegramBot:
                 # 여러 개의 메시지를 한 번에 소모하기 위해 루프 사용
                 while True:
                     msg = notify_q.get_nowait()
-                    await context.bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=str(msg))
+                    await context.bot.send_message(chat_id=chat_id, text=str(msg))
             except Empty:
                 # 전송할 메시지가 없는 경우
                 pass
@@ -88,7 +102,7 @@ class TelegramBot:
 
         async def _run() -> None:
             # 기본 ApplicationBuilder
-            builder = ApplicationBuilder().token(TELEGRAM_TOKEN)
+            builder = ApplicationBuilder().token(token)
 
             # AIORateLimiter 가 정상적으로 초기화되는 경우에만 적용한다.
             try:
@@ -130,7 +144,7 @@ class TelegramBot:
                     await application.stop()
 
             # Application 이 실제로 실행(drive)된 후에 백그라운드 태스크를 등록해야 PTB 경고가 발생하지 않는다.
-            logger.info("TelegramBot 시작 – 챗 ID=%s", TELEGRAM_CHAT_ID)
+            logger.info("TelegramBot 시작 – 챗 ID=%s", chat_id)
 
             # ------------------ PTB life-cycle 수동 제어 ------------------
             async with application:
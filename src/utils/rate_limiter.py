@@ -20,41 +20,42 @@ class TokenBucket:
         self.capacity = capacity
         self.refill_rate = refill_rate
         self.tokens = float(capacity)
-        self.last_refill = time.time()
+        self.last_refill = time.monotonic()
         self.lock = threading.Lock()
-    
+
+    def _refill(self) -> None:
+        """경과 시간만큼 토큰 보충 (lock 보유 상태에서 호출)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
     def consume(self, tokens: int = 1) -> bool:
         """토큰을 소비하고 성공 여부를 반환"""
         with self.lock:
-            now = time.time()
-            # 토큰 보충
-            time_passed = now - self.last_refill
-            self.tokens = min(self.capacity, self.tokens + time_passed * self.refill_rate)
-            self.last_refill = now
-            
+            self._refill()
+
             # 토큰 소비 가능한지 확인
             if self.tokens >= tokens:
                 self.tokens -= tokens
                 return True
             return False
-    
+
     def wait_for_token(self, tokens: int = 1, timeout: float = 30.0) -> bool:
-        """토큰이 사용 가능할 때까지 대기"""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            if self.consume(tokens):
-                return True
-            
-            # 필요한 토큰이 사용 가능해질 때까지 대기 시간 계산
-            with self.lock:
-                if self.tokens < tokens:
-                    wait_time = (tokens - self.tokens) / self.refill_rate
-                    time.sleep(min(wait_time, 0.1))  # 최대 0.1초씩 대기
-                else:
-                    time.sleep(0.01)
-        
-        return False
+        """토큰을 예약하고 부족분이 채워지는 데 필요한 시간만큼만 한 번 대기
+
+        토큰이 충분하면 즉시 반환한다. 부족하면 잔량을 음수로 만들어 선점(예약)한 뒤 잠금 밖에서
+        정확히 (부족분 / 보충 속도) 초만 잔다 – 다음 호출자는 그 뒤 순번으로 대기 시간이 계산된다.
+        """
+        with self.lock:
+            self._refill()
+            wait_time = (tokens - self.tokens) / self.refill_rate if self.tokens < tokens else 0.0
+            if wait_time > timeout:
+                return False
+            self.tokens -= tokens
+
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return True
 
 
 class RateLimiter:
@@ -6,13 +6,16 @@ from __future__ import annotations
 향후 기준(변동성, 시총 등)을 추가하고 싶다면 `select_symbols` 메서드를 확장하면 된다.
 """
 
-from typing import List, Optional, Dict, Set
+from typing import TYPE_CHECKING, List, Optional, Dict, Set
 import time
 from threading import Lock
 
 import requests  # Upbit REST API 호출용
 
 from src.utils.logger import get_logger
+
+if TYPE_CHECKING:  # pragma: no cover
+    from src.utils.buyable_set import BuyableSet
 from config.settings import TOP_N_SYMBOLS, SAFETY_FILTERS
 
 logger = get_logger(__name__)
@@ -25,7 +28,7 @@ class SymbolManager:  # pylint: disable=too-few-public-methods
         initial_symbols (list[str]): 최초 심볼 리스트 (fallback)
         refresh_interval (int): 재평가 주기(초)
         max_symbols (int): 유지할 최대 종목 수
-        buyable_symbols (Optional[Dict[str, bool]]): IndicatorWorker 가 업데이트하는 공유 dict.
+        buyable_symbols (Optional[BuyableSet]): IndicatorWorker 가 업데이트하는 공유 플래그 배열 (keys()/len() 지원).
             제공 시 안전 필터 통과 & buyable 에 포함된 종목만 후보군으로 사용한다.
     """
 
@@ -34,7 +37,7 @@ class SymbolManager:  # pylint: disable=too-few-public-methods
         initial_symbols: List[str],
         refresh_interval: int = 600,
         max_symbols: int = TOP_N_SYMBOLS,
-        buyable_symbols: Optional[Dict[str, bool]] = None,
+        buyable_symbols: Optional[BuyableSet] = None,
     ):
 
         self._symbols: List[str] = initial_symbols.copy()
@@ -43,7 +46,7 @@ class SymbolManager:  # pylint: disable=too-few-public-methods
         self.max_symbols = max_symbols
         self._lock = Lock()
 
-        # buyable dict (Manager dict) – key 만 사용
+        # buyable 집합 (SharedMemory 플래그 배열) – keys() 만 사용
         self._buyable_symbols = buyable_symbols
 
         # 안전 티커 캐시
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+"""TickRing – SharedMemory 기반 SPMC(단일 생산자·다중 소비자) 틱 링 버퍼.
+
+WebSocket 프로세스가 고정 길이 레코드를 공유 메모리에 직접 기록하고, 소비자는 각자 로컬 tail 인덱스로
+같은 버퍼를 읽는다. 틱마다 pickle·Manager RPC 를 거치지 않으며, 한 링의 모든 소비자가 동일한 틱 스트림을
+받는다(브로드캐스트). 종목을 나눠 맡는 소비자(IndicatorWorker)는 워커마다 링을 따로 두고, 생산자가
+partition_of 로 종목별 링을 골라 기록한다.
+
+소비자가 느려 버퍼 한 바퀴 이상 뒤처지면 가장 오래된 틱부터 버린다(drop-oldest).
+"""
+
+import multiprocessing as mp
+import struct
+import sys
+import time
+import zlib
+from multiprocessing import shared_memory
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.strategy.tick import KIND_ORDERBOOK, TickView
+
+# ts_ms:i64, trade_price:f64, volume:f64, best_bid:f64, best_ask:f64, symbol_id:u16, kind:u8 (+5 패딩)
+# 슬롯 크기와 레코드 크기를 일치시켜 연속 구간을 iter_unpack 으로 한 번에 읽는다.
+TICK_STRUCT = struct.Struct("<qddddHB5x")
+SLOT_SIZE = TICK_STRUCT.size  # 48 bytes (8바이트 정렬)
+
+
+def partition_of(market: str, count: int) -> int:
+    """market ➜ 담당 파티션 인덱스
+
+    crc32 는 프로세스·재시작과 무관하게 고정되고 symbol_id 부여 순서와도 무관하므로,
+    종목 교체가 반복돼도 한 파티션에 종목이 몰리지 않는다.
+    """
+    return zlib.crc32(market.encode()) % count
+
+
+class TickRing:
+    """공유 메모리 틱 링 버퍼
+
+    Args:
+        symbol_table: symbol_id ➜ market 매핑을 공유할 Manager dict
+        n_slots: 링 버퍼 슬롯 수
+    """
+
+    DEFAULT_SLOTS = 8192
+
+    def __init__(self, symbol_table: Dict[int, str], n_slots: int = DEFAULT_SLOTS):
+        self.n_slots = n_slots
+        self._shm = shared_memory.SharedMemory(create=True, size=SLOT_SIZE * n_slots)
+        # head 는 생산자만 (cond 잠금 하에서) 증가시키므로 RawValue 로 충분
+        self._head = mp.Value("Q", 0, lock=False)
+        # 생산자가 기록 중인 구간의 끝 – 슬롯을 덮어쓰기 전에 먼저 올린다 (소비자는 복사 후 이 값으로 유실 판정)
+        self._write_end = mp.Value("Q", 0, lock=False)
+        self._cond = mp.Condition(mp.Lock())
+        self._symbol_table = symbol_table
+        self._init_local_state()
+
+    # ------------------------------------------------------------------
+    # Pickle (spawn 시 Process args 로 전달)
+    # ------------------------------------------------------------------
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "n_slots": self.n_slots,
+            "shm_name": self._shm.name,
+            "head": self._head,
+            "write_end": self._write_end,
+            "cond": self._cond,
+            "symbol_table": self._symbol_table,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.n_slots = state["n_slots"]
+        self._shm = shared_memory.SharedMemory(name=state["shm_name"])
+        self._head = state["head"]
+        self._write_end = state["write_end"]
+        self._cond = state["cond"]
+        self._symbol_table = state["symbol_table"]
+        self._init_local_state()
+
+    def _init_local_state(self) -> None:
+        self._buf = self._shm.buf
+        # 생산자: market ➜ symbol_id
+        self._symbol_ids: Dict[str, int] = {}
+        # 소비자: symbol_id ➜ market (공유 dict 의 로컬 캐시)
+        self._symbols: Dict[int, str] = {}
+        self._tail: Optional[int] = None
+
+    # ------------------------------------------------------------------
+    # Producer
+    # ------------------------------------------------------------------
+
+    def put(
+        self,
+        symbol: str,
+        kind: int,
+        price: float,
+        volume: float = 0.0,
+        ts_ms: Optional[int] = None,
+        best_bid: float = 0.0,
+        best_ask: float = 0.0,
+    ) -> None:
+        """틱 하나를 고정 길이 레코드로 기록
+
+        WebSocket 프로세스가 원본 메시지에서 꺼낸 값을 그대로 넘긴다(중간 dict 가공 없음).
+        """
+        symbol_id = self._symbol_id_of(symbol)
+
+        with self._cond:
+            head = self._head.value
+            self._write_end.value = head + 1
+            TICK_STRUCT.pack_into(
+                self._buf,
+                (head % self.n_slots) * SLOT_SIZE,
+                int(ts_ms or time.time() * 1000),
+                float(price),
+                float(volume or 0.0),
+                float(best_bid),
+                float(best_ask),
+                symbol_id,
+                kind,
+            )
+            self._head.value = head + 1
+            self._cond.notify_all()
+
+    def put_many(self, ticks: List[Tuple[str, int, float, float, Optional[int], float, float]]) -> None:
+        """(symbol, kind, price, volume, ts_ms, best_bid, best_ask) 튜플 여러 개를 한 번의 잠금·notify 로 기록
+
+        소비자 깨우기(notify_all)와 잠금 획득이 틱 수가 아니라 배치 수만큼만 일어난다.
+        """
+        if not ticks:
+            return
+        symbol_id_of = self._symbol_id_of
+        records = [
+            (int(ts_ms or time.time() * 1000), float(price), float(volume or 0.0),
+             float(best_bid), float(best_ask), symbol_id_of(symbol), kind)
+            for symbol, kind, price, volume, ts_ms, best_bid, best_ask in ticks
+        ]
+
+        pack_into = TICK_STRUCT.pack_into
+        buf = self._buf
+        n_slots = self.n_slots
+        with self._cond:
+            head = self._head.value
+            self._write_end.value = head + len(records)
+            for record in records:
+                pack_into(buf, (head % n_slots) * SLOT_SIZE, *record)
+                head += 1
+            self._head.value = head
+            self._cond.notify_all()
+
+    def _symbol_id_of(self, symbol: str) -> int:
+        """market ➜ symbol_id (처음 보는 종목이면 공유 테이블에 새 id 등록)"""
+        symbol_id = self._symbol_ids.get(symbol)
+        if symbol_id is None:
+            # WebSocket 프로세스 재시작 시에도 기존 id 를 유지하도록 공유 테이블에서 복원
+            self._symbol_ids = {m: i for i, m in self._symbol_table.items()}
+            symbol_id = self._symbol_ids.get(symbol)
+            if symbol_id is None:
+                symbol_id = self._symbol_ids[symbol] = len(self._symbol_ids)
+                self._symbol_table[symbol_id] = symbol
+        return symbol_id
+
+    # ------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------
+
+    def get(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """다음 틱을 dict 로 반환 – queue.Queue.get 과 동일하게 시간 초과 시 Empty"""
+        return self._get_one(timeout, self._to_tick)
+
+    def get_view(self, timeout: Optional[float] = None) -> TickView:
+        """get 과 같되 TickView 로 반환 (전략 경로용 – dict 생성 생략)"""
+        return self._get_one(timeout, self._to_view)
+
+    def _get_one(self, timeout: Optional[float], convert: Callable[[tuple], Any]) -> Any:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            self._wait(deadline)
+            tick = self._read_next(convert)
+            if tick is not None:
+                return tick
+
+    def get_many(self, max_items: int = 256, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """쌓여 있는 틱을 최대 max_items 개까지 dict 로 한 번에 반환
+
+        틱이 하나도 없으면 timeout 까지 대기하고, 그래도 없으면 Empty 를 발생시킨다.
+        """
+        return self._get_batch(max_items, timeout, self._to_tick)
+
+    def get_views(self, max_items: int = 256, timeout: Optional[float] = None) -> List[TickView]:
+        """get_many 와 같되 TickView 리스트로 반환"""
+        return self._get_batch(max_items, timeout, self._to_view)
+
+    def get_prices(self, max_items: int = 256, timeout: Optional[float] = None) -> List[Tuple[str, float]]:
+        """get_many 와 같되 (market, trade_price) 튜플만 반환 – 가격만 필요한 소비자용 (dict 생성 생략)"""
+        return self._get_batch(max_items, timeout, self._to_price)
+
+    def get_price_ids(self, max_items: int = 256, timeout: Optional[float] = None) -> List[Tuple[int, float]]:
+        """get_prices 와 같되 (symbol_id, trade_price) 튜플 반환 – 종목 상태를 정수 인덱스로 관리하는 소비자용"""
+        return self._get_batch(max_items, timeout, self._to_price_id)
+
+    def _get_batch(self, max_items: int, timeout: Optional[float], convert: Callable[[tuple], Any]) -> List[Any]:
+        """tail~head 연속 구간을 레코드 단위 호출 없이 iter_unpack 으로 일괄 디코딩하여 convert 결과 리스트 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            self._wait(deadline)
+            head = self._head.value
+            start = max(self._tail, head - self.n_slots)  # 한 바퀴 이상 뒤처졌으면 오래된 틱 버림
+            end = min(head, start + max_items)
+            records = self._unpack_range(start, end)
+            self._tail = end
+
+            # 읽는 도중 생산자가 덮어썼거나 덮어쓰는 중일 수 있는 앞부분 폐기
+            # (head 가 아니라 write_end 기준 – put_many 는 head 공개 전에 배치 전체를 기록한다)
+            lost = self._write_end.value - self.n_slots - start
+            if lost > 0:
+                records = records[lost:]
+
+            items = [item for item in map(convert, records) if item is not None]
+            if items:
+                return items
+
+    def _unpack_range(self, start: int, end: int) -> List[tuple]:
+        """[start, end) 레코드를 링 경계를 고려해 최대 두 구간으로 나눠 디코딩"""
+        first = start % self.n_slots
+        count = end - start
+        if first + count <= self.n_slots:
+            return list(TICK_STRUCT.iter_unpack(self._buf[first * SLOT_SIZE:(first + count) * SLOT_SIZE]))
+        split = self.n_slots - first
+        records = list(TICK_STRUCT.iter_unpack(self._buf[first * SLOT_SIZE:]))
+        records.extend(TICK_STRUCT.iter_unpack(self._buf[:(count - split) * SLOT_SIZE]))
+        return records
+
+    def _wait(self, deadline: Optional[float]) -> None:
+        """읽을 레코드가 생길 때까지 대기 (deadline 초과 시 Empty)"""
+        if self._tail is None:
+            self._tail = self._head.value
+
+        if self._head.value > self._tail:
+            return
+
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            raise Empty
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._head.value > self._tail, remaining):
+                raise Empty
+
+    def _read_next(self, convert: Callable[[tuple], Any]) -> Any:
+        """tail 위치의 레코드 하나를 읽고 tail 을 전진 (덮어써진 레코드는 None)"""
+        head = self._head.value
+        if head - self._tail > self.n_slots:
+            # 한 바퀴 이상 뒤처짐 – 가장 오래된 틱을 버리고 따라잡는다
+            self._tail = head - self.n_slots
+
+        idx = self._tail
+        record = TICK_STRUCT.unpack_from(self._buf, (idx % self.n_slots) * SLOT_SIZE)
+        self._tail = idx + 1
+
+        # 읽는 도중 생산자가 같은 슬롯을 덮어썼거나 덮어쓰는 중이라면 폐기
+        if self._write_end.value - idx > self.n_slots:
+            return None
+
+        return convert(record)
+
+    def market_of(self, symbol_id: int) -> Optional[str]:
+        """symbol_id ➜ market (알 수 없으면 None)"""
+        market = self._symbols.get(symbol_id)
+        if market is None:
+            # 소비자 쪽 심볼 문자열은 intern 하여 설정 dict 조회 시 포인터 비교로 끝나게 한다
+            self._symbols = {i: sys.intern(m) for i, m in self._symbol_table.items()}
+            market = self._symbols.get(symbol_id)
+        return market
+
+    def _to_price(self, record: tuple) -> Optional[Tuple[str, float]]:
+        """디코딩된 레코드 → (market, trade_price) (알 수 없는 symbol_id 는 None)"""
+        market = self.market_of(record[5])
+        return None if market is None else (market, record[1])
+
+    @staticmethod
+    def _to_price_id(record: tuple) -> Tuple[int, float]:
+        """디코딩된 레코드 → (symbol_id, trade_price)"""
+        return record[5], record[1]
+
+    def _to_view(self, record: tuple) -> Optional[TickView]:
+        """디코딩된 레코드 → TickView (알 수 없는 symbol_id 는 None)"""
+        ts, price, volume, best_bid, best_ask, symbol_id, kind = record
+        market = self.market_of(symbol_id)
+        if market is None:
+            return None
+        return TickView(market, kind, price, volume, ts, best_bid, best_ask, symbol_id)
+
+    def _to_tick(self, record: tuple) -> Optional[Dict[str, Any]]:
+        """디코딩된 레코드 → 틱 dict (알 수 없는 symbol_id 는 None)"""
+        ts, price, volume, best_bid, best_ask, symbol_id, kind = record
+        market = self.market_of(symbol_id)
+        if market is None:
+            return None
+
+        # market/code 는 symbol_id 에서 바로 채우므로 소비자 쪽 추가 태깅이 필요 없다
+        if kind == KIND_ORDERBOOK:
+            return {
+                "type": "orderbook",
+                "code": market,
+                "market": market,
+                "trade_price": price,
+                "trade_volume": volume,
+                "timestamp": ts,
+                "best_bid": best_bid,
+                "best_ask": best_ask,
+                "spread": best_ask - best_bid,
+            }
+        return {
+            "type": "ticker",
+            "code": market,
+            "market": market,
+            "trade_price": price,
+            "trade_volume": volume,
+            "timestamp": ts,
+        }
+
+    # ------------------------------------------------------------------
+    # Cleanup
+    # ------------------------------------------------------------------
+
+    def close(self) -> None:
+        """현재 프로세스의 매핑 해제"""
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """공유 메모리 세그먼트 삭제 (생성한 메인 프로세스에서만 호출)"""
+        self._shm.unlink()